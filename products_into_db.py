@@ -1,25 +1,159 @@
 from __future__ import annotations
-import re
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
-import argparse
-import certifi  # Up-to-date CA bundle
+from typing import List, Dict, Any
+import atexit
+import csv
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import sqlite3
 from pathlib import Path
-import sys
-import pandas as pd
-from datetime import datetime
 import json
+import orjson
+from queued_logging import get_queued_logger
+
+# Progress goes through the shared logging queue (see queued_logging), level via YONEX_LOG_LEVEL
+logger = get_queued_logger(__name__, "YONEX_LOG_LEVEL")
 
 BASE_URL = "https://www.yonex.ch"
 
 # Database and CSV directories - organized in specific folders
 DB_DIR = Path(__file__).parent / 'yonex_data' / 'databases'
 CSV_DIR = Path(__file__).parent / 'yonex_data' / 'csv_exports'
+CSV_WRITE_BUFFER = 1 << 20
+
+# Shared HTTP session: keeps connections (and TLS sessions) alive across requests
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+))
+
+# Placeholder stored until the size analysis for a product has run
+PENDING_SIZES_JSON = json.dumps({"available": [], "sold_out": [], "note": "Size analysis pending"})
+
+# Insert-or-update keyed on (type, pic_url): an existing row keeps its id and is updated in place,
+# last_seen included, so every listed product is written on each store. Products sharing an image
+# within one batch collapse into one row (the last one wins, as in the checker's image-keyed dicts).
+# Products without an image are not part of the key (see init_db) and are always inserted.
+# A pending placeholder never overwrites sizes that were already analyzed.
+UPSERT_PRODUCT_SQL = f"""
+    INSERT INTO products (name, pic_url, description, price, sizes, type)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(type, pic_url) WHERE pic_url <> '' DO UPDATE SET
+        name = excluded.name,
+        description = excluded.description,
+        price = excluded.price,
+        sizes = CASE
+            WHEN excluded.sizes = '{PENDING_SIZES_JSON}' THEN COALESCE(NULLIF(products.sizes, ''), excluded.sizes)
+            ELSE excluded.sizes
+        END,
+        last_seen = CURRENT_TIMESTAMP
+"""
+
+# Full-table reload with explicit sequential ids
+REBUILD_INSERT_SQL = """
+    INSERT INTO products (id, name, pic_url, description, price, sizes, type)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Upper bound on concurrently fetched category pages
+PARALLEL_FETCH_WORKERS = 8
+
+# Only the product area is turned into a tree; navigation, header and footer markup is skipped
+CONTENT_STRAINER = SoupStrainer('div', id='content3')
+# Product headers plus the block parts that follow them as siblings
+PRODUCT_BLOCK_SELECTOR = (
+    "h2.underline, h2.underline ~ div.image, "
+    "h2.underline ~ div.description, h2.underline ~ dl.attributes"
+)
+
+# WAL + synchronous=NORMAL drops the fsync on every commit and the rollback-journal rewrite
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+# Only used while rebuild_database wipes and refills the table - intermediate state is not worth an fsync
+BULK_LOAD_PRAGMAS = ("PRAGMA synchronous=OFF", "PRAGMA journal_mode=MEMORY")
+
+def _apply_pragmas(conn: sqlite3.Connection, pragmas: tuple) -> None:
+    """Run each PRAGMA to completion (journal_mode returns a row that must be consumed)."""
+    for pragma in pragmas:
+        conn.execute(pragma).fetchall()
+
+# One connection per database file for the lifetime of the process
+_CONNECTIONS: Dict[str, sqlite3.Connection] = {}
+_CONNECTIONS_LOCK = threading.Lock()
 
-@dataclass
+def _get_conn(db_path: Path) -> sqlite3.Connection:
+    """Return the cached connection for db_path, opening it on first use.
+    Connections are in autocommit mode with the write-performance PRAGMAs applied;
+    wrap writes in `with conn:` plus an explicit BEGIN so failures roll back."""
+    key = str(db_path)
+    with _CONNECTIONS_LOCK:
+        conn = _CONNECTIONS.get(key)
+        if conn is None:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(key, isolation_level=None, check_same_thread=False)
+            _apply_pragmas(conn, SQLITE_PRAGMAS)
+            _CONNECTIONS[key] = conn
+        return conn
+
+def _rebuild_rows(products: List[Dict[str, Any]]) -> list:
+    """Rows for REBUILD_INSERT_SQL with sequential IDs starting from 1.
+    Products sharing a (type, pic_url) key collapse into one row like in the upsert path (first position,
+    last data); last_seen is left to the column's CURRENT_TIMESTAMP default."""
+    unique = {}
+    for position, product in enumerate(products):
+        key = (product['type'], product['pic_url']) if product['pic_url'] else position
+        unique[key] = product
+    return [
+        (
+            index,
+            product['name'],
+            product['pic_url'],
+            product['description'],
+            product['price'],
+            product.get('sizes', ''),
+            product['type']
+        )
+        for index, product in enumerate(unique.values(), start=1)
+    ]
+
+def _upsert_products(conn: sqlite3.Connection, rows: list, category_name: str) -> None:
+    """Upsert a category's rows in one transaction and drop the products that are no longer listed.
+    Rows are (name, pic_url, description, price, sizes, type) tuples."""
+    with conn:
+        # Take the write lock up front; the transaction only writes
+        conn.execute("BEGIN IMMEDIATE")
+        # Image-less products cannot be matched to their old rows, so they are replaced as a whole
+        conn.execute("DELETE FROM products WHERE type = ? AND pic_url = ''", (category_name,))
+        conn.executemany(UPSERT_PRODUCT_SQL, rows)
+        # Remove products of this category that were not part of this batch
+        conn.execute(
+            "DELETE FROM products WHERE type = ? AND pic_url NOT IN (SELECT value FROM json_each(?))",
+            (category_name, json.dumps([row[1] for row in rows]))
+        )
+        conn.commit()
+
+@atexit.register
+def _close_connections() -> None:
+    """Close every cached connection on interpreter shutdown."""
+    with _CONNECTIONS_LOCK:
+        for conn in _CONNECTIONS.values():
+            conn.close()
+        _CONNECTIONS.clear()
+
+@dataclass(slots=True, frozen=True)
 class Product:
     name: str
     pic_url: str
@@ -28,13 +162,18 @@ class Product:
     sizes: str  # JSON string containing size analysis
 
 class Product_into_db:
+    @staticmethod
+    def get_connection(db_path: Path) -> sqlite3.Connection:
+        """Shared connection for db_path (autocommit, WAL). Wrap writes in `with conn:` plus an explicit BEGIN."""
+        return _get_conn(db_path)
+
     @staticmethod
     def init_db(db_path: Path) -> None:
         """Initializes the SQLite database and creates the products table if it doesn't exist."""
-        # Create db directory if it doesn't exist
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with sqlite3.connect(db_path) as conn:
+        conn = _get_conn(db_path)
+        with conn:
+            # One transaction for the whole schema check instead of one implicit commit per statement
+            conn.execute("BEGIN")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS products (
                     id INTEGER PRIMARY KEY,
@@ -50,6 +189,23 @@ class Product_into_db:
             # Create index for better search performance
             conn.execute("CREATE INDEX IF NOT EXISTS idx_products_name ON products(name)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_products_type ON products(type)")
+            
+            # Unique key for upserts. Products without an image all share pic_url '' and stay out of it,
+            # so distinct image-less products are never merged. Databases created before the key existed
+            # may hold duplicates; an older full index (which did merge them) is replaced.
+            index_row = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_products_type_picurl'"
+            ).fetchone()
+            if index_row is None or 'WHERE' not in index_row[0]:
+                conn.execute("DROP INDEX IF EXISTS idx_products_type_picurl")
+                conn.execute("""
+                    DELETE FROM products WHERE pic_url <> '' AND rowid NOT IN (
+                        SELECT MAX(rowid) FROM products WHERE pic_url <> '' GROUP BY type, pic_url
+                    )
+                """)
+                conn.execute(
+                    "CREATE UNIQUE INDEX idx_products_type_picurl ON products(type, pic_url) WHERE pic_url <> ''"
+                )
             conn.commit()
 
     @staticmethod
@@ -57,86 +213,83 @@ class Product_into_db:
         """Completely rebuild the database with fresh data in sequential order. Returns number of inserted records."""
         Product_into_db.init_db(db_path)
         
-        with sqlite3.connect(db_path) as conn:
-            # Clear all existing data
-            conn.execute("DELETE FROM products")
-            # Reset the auto-increment counter
-            conn.execute("DELETE FROM sqlite_sequence WHERE name='products'")
-            print(f"🗑️ Cleared existing data from {db_path}")
+        # Build all rows up front so the whole batch goes through a single executemany
+        rows = _rebuild_rows(products)
+        
+        conn = _get_conn(db_path)
+        _apply_pragmas(conn, BULK_LOAD_PRAGMAS)
+        try:
+            with conn:
+                conn.execute("BEGIN")
+                # Clear all existing data
+                conn.execute("DELETE FROM products")
+                logger.info("🗑️ Cleared existing data from %s", db_path)
             
-            # Insert all products with sequential IDs starting from 1
-            inserted = 0
-            for index, product in enumerate(products, start=1):
-                conn.execute("""
-                    INSERT INTO products (id, name, pic_url, description, price, sizes, type, last_seen)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    index,  # Sequential ID starting from 1
-                    product['name'],
-                    product['pic_url'],
-                    product['description'],
-                    product['price'],
-                    product.get('sizes', ''),
-                    product['type'],
-                    datetime.now().isoformat()
-                ))
-                inserted += 1
+                # Insert all products with sequential IDs starting from 1
+                conn.executemany(REBUILD_INSERT_SQL, rows)
+                inserted = len(rows)
             
-            conn.commit()
+                conn.commit()
+        finally:
+            _apply_pragmas(conn, SQLITE_PRAGMAS)
         
-        print(f"✅ Rebuilt database with {inserted} products in sequential order (IDs 1-{inserted})")
+        logger.info("✅ Rebuilt database with %d products in sequential order (IDs 1-%d)", inserted, inserted)
         return inserted
 
     @staticmethod
     def export_to_csv(products: list, category_name: str) -> None:
         """Export products to CSV with size information."""
-        import csv
-        
         csv_dir = DB_DIR.parent / 'csv_exports'
         csv_dir.mkdir(parents=True, exist_ok=True)
         csv_path = csv_dir / f"{category_name}_products.csv"
         
+        # Build every row first, then hand them to the C csv writer in one call
+        rows = []
+        for product in products:
+            # Parse sizes JSON
+            try:
+                sizes_data = orjson.loads(product.sizes)
+                available = ', '.join(sizes_data.get('available', []))
+                sold_out = ', '.join(sizes_data.get('sold_out', []))
+                analysis = 'Success' if not sizes_data.get('error') else f"Error: {sizes_data.get('error')}"
+            except (orjson.JSONDecodeError, AttributeError, TypeError):
+                available = ''
+                sold_out = ''
+                analysis = 'Parse Error'
+            
+            rows.append((
+                product.name,
+                product.pic_url,
+                product.description,
+                product.price,
+                available,
+                sold_out,
+                analysis
+            ))
+        
+        # Serialize into memory (csv keeps the quoting rules), then write the file in one call
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        # Header with sizes columns
+        writer.writerow(['name', 'pic_url', 'description', 'price', 'sizes_available', 'sizes_sold_out', 'sizes_analysis_status'])
+        writer.writerows(rows)
+        
         try:
-            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                
-                # Header with sizes columns
-                writer.writerow(['name', 'pic_url', 'description', 'price', 'sizes_available', 'sizes_sold_out', 'sizes_analysis_status'])
-                
-                # Data rows
-                for product in products:
-                    # Parse sizes JSON
-                    try:
-                        sizes_data = json.loads(product.sizes)
-                        available = ', '.join(sizes_data.get('available', []))
-                        sold_out = ', '.join(sizes_data.get('sold_out', []))
-                        analysis = 'Success' if not sizes_data.get('error') else f"Error: {sizes_data.get('error')}"
-                    except:
-                        available = ''
-                        sold_out = ''
-                        analysis = 'Parse Error'
-                    
-                    writer.writerow([
-                        product.name,
-                        product.pic_url,
-                        product.description,
-                        product.price,
-                        available,
-                        sold_out,
-                        analysis
-                    ])
+            with open(csv_path, 'w', newline='', encoding='utf-8', buffering=CSV_WRITE_BUFFER) as f:
+                f.write(buffer.getvalue())
             
-            print(f"📊 CSV exported to {csv_path}")
+            logger.info("📊 CSV exported to %s", csv_path)
             
         except Exception as e:
-            print(f"❌ Error exporting CSV: {e}")
+            logger.error("❌ Error exporting CSV: %s", e)
 
     @staticmethod
     def store_products_from_dict(products_dict: dict, category_name: str) -> None:
         """Store products from a dictionary (already scraped data) without re-scraping or re-analyzing."""
         try:
             if not products_dict:
-                print("⚠️ No products to store")
+                logger.warning("⚠️ No products to store")
                 return
             
             # Create database path
@@ -145,135 +298,171 @@ class Product_into_db:
             # Create database
             Product_into_db.init_db(db_path)
             
-            # Store products
-            with sqlite3.connect(db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Clear existing data for this category
-                cursor.execute("DELETE FROM products WHERE type = ?", (category_name,))
+            # Build rows from dictionary
+            rows = []
+            for image_url, product_data in products_dict.items():
+                description = product_data.get('original_description', product_data.get('description', ''))
                 
-                # Insert products from dictionary
-                for image_url, product_data in products_dict.items():
-                    description = product_data.get('original_description', product_data.get('description', ''))
-                    
-                    # Check if sizes already analyzed (passed from caller), otherwise skip Gemini
-                    # This avoids redundant API calls when data already has size info
-                    if 'sizes' in product_data and product_data['sizes']:
-                        sizes_json = product_data['sizes'] if isinstance(product_data['sizes'], str) else json.dumps(product_data['sizes'])
-                    else:
-                        # Only call Gemini if sizes not already provided
-                        # For bulk storage, we skip Gemini to avoid rate limits - sizes can be added later
-                        sizes_json = json.dumps({"available": [], "sold_out": [], "note": "Size analysis pending"})
-                    
-                    cursor.execute('''
-                        INSERT INTO products (name, pic_url, description, price, sizes, type)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        product_data.get('name', ''),
-                        image_url,
-                        description,
-                        product_data.get('price', ''),
-                        sizes_json,
-                        category_name
-                    ))
+                # Check if sizes already analyzed (passed from caller), otherwise skip Gemini
+                # This avoids redundant API calls when data already has size info
+                if 'sizes' in product_data and product_data['sizes']:
+                    sizes_json = product_data['sizes'] if isinstance(product_data['sizes'], str) else json.dumps(product_data['sizes'])
+                else:
+                    # Only call Gemini if sizes not already provided
+                    # For bulk storage, we skip Gemini to avoid rate limits - sizes can be added later
+                    sizes_json = PENDING_SIZES_JSON
                 
-                conn.commit()
-                print(f"📦 Stored {len(products_dict)} products in {db_path}")
+                rows.append((
+                    product_data.get('name', ''),
+                    image_url,
+                    description,
+                    product_data.get('price', ''),
+                    sizes_json,
+                    category_name
+                ))
+            
+            # Store products (existing rows are updated in place)
+            _upsert_products(_get_conn(db_path), rows, category_name)
+            logger.info("📦 Stored %d products in %s", len(products_dict), db_path)
             
         except Exception as e:
-            print(f"❌ Error in store_products_from_dict: {e}")
+            logger.error("❌ Error in store_products_from_dict: %s", e)
+
+    @staticmethod
+    def store_products(products: list, category_name: str) -> None:
+        """Store scraped Product objects in the category-specific database and export them to CSV."""
+        if not products:
+            logger.warning("⚠️ No products found to store")
+            return
+        
+        # Create database path
+        db_path = DB_DIR / f"{category_name}_products.db"
+        
+        # Create database
+        Product_into_db.init_db(db_path)
+        
+        rows = [
+            (
+                product.name,
+                product.pic_url,
+                product.description,
+                product.price,
+                product.sizes,
+                category_name
+            )
+            for product in products
+        ]
+        
+        # Store products (existing rows are updated in place)
+        _upsert_products(_get_conn(db_path), rows, category_name)
+        logger.info("📦 Stored %d products in %s", len(products), db_path)
+        
+        # Also create CSV export with size information
+        Product_into_db.export_to_csv(products, category_name)
 
     @staticmethod
     def scrape_and_store(url: str, category_name: str, insecure: bool = False) -> None:
         """Scrape products from URL and store in category-specific database with size analysis."""
         try:
-            print(f"🔗 Scraping products from {url}...")
+            logger.info("🔗 Scraping products from %s...", url)
             
             # Get products with size analysis
             products = Product_into_db.get_products(url, insecure=insecure)
             
-            if not products:
-                print("⚠️ No products found to store")
-                return
-            
-            # Create database path
-            db_path = DB_DIR / f"{category_name}_products.db"
-            
-            # Create database
-            Product_into_db.init_db(db_path)
-            
-            # Store products
-            with sqlite3.connect(db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Clear existing data for this category
-                cursor.execute("DELETE FROM products WHERE type = ?", (category_name,))
-                
-                # Insert new products
-                for product in products:
-                    cursor.execute('''
-                        INSERT INTO products (name, pic_url, description, price, sizes, type)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        product.name,
-                        product.pic_url,
-                        product.description,
-                        product.price,
-                        product.sizes,
-                        category_name
-                    ))
-                
-                conn.commit()
-                print(f"📦 Stored {len(products)} products in {db_path}")
-            
-            # Also create CSV export with size information
-            Product_into_db.export_to_csv(products, category_name)
+            Product_into_db.store_products(products, category_name)
             
         except Exception as e:
-            print(f"❌ Error in scrape_and_store: {e}")
+            logger.error("❌ Error in scrape_and_store: %s", e)
+
+    @staticmethod
+    def scrape_and_store_many(urls: List[str], categories: List[str], insecure: bool = False) -> None:
+        """Scrape several category pages concurrently, then store each one in its own database."""
+        logger.info("🔗 Scraping %d category pages in parallel...", len(urls))
+        product_lists = Product_into_db.get_products_parallel(urls, insecure=insecure)
+        
+        for category_name, products in zip(categories, product_lists):
+            try:
+                Product_into_db.store_products(products, category_name)
+            except Exception as e:
+                logger.error("❌ Error storing %s: %s", category_name, e)
+
+    @staticmethod
+    def get_products_parallel(urls: List[str], insecure: bool = False) -> List[list]:
+        """Fetch and parse several pages concurrently. Returns one product list per URL, in input order."""
+        if not urls:
+            return []
+        
+        # Fetching is network-bound, so threads overlap the requests despite the GIL
+        with ThreadPoolExecutor(max_workers=min(PARALLEL_FETCH_WORKERS, len(urls))) as executor:
+            return list(executor.map(lambda url: Product_into_db.get_products(url, insecure=insecure), urls))
 
     @staticmethod
     def get_products(url: str, insecure: bool = False) -> list:
         """Get products from the URL and return as list of Product objects."""
         products = []
         
+        response = None
         try:
-            if insecure:
-                response = requests.get(url, verify=False, timeout=10)
-            else:
-                response = requests.get(url, timeout=10)
+            # stream=True: the body is handed to the parser without building response.text first
+            response = _SESSION.get(url, verify=not insecure, timeout=10, stream=True)
             
             response.raise_for_status()
             
         except requests.RequestException as e:
-            print(f"❌ Error fetching {url}: {e}")
+            logger.error("❌ Error fetching %s: %s", url, e)
+            if response is not None:
+                response.close()
             return products
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # lxml is a C parser; feeding it the decompressed byte stream lets it do the charset detection itself
+        with response:
+            response.raw.decode_content = True
+            try:
+                soup = BeautifulSoup(response.raw, 'lxml', parse_only=CONTENT_STRAINER)
+            except HTTPError as e:
+                logger.error("❌ Error reading %s: %s", url, e)
+                return products
         
         # Extract only the product content area
         main_content = soup.find('div', id='content3')
         if not main_content:
-            print("⚠️ Could not find main content area")
+            logger.warning("⚠️ Could not find main content area")
             return products
         
-        headers = main_content.find_all('h2', class_='underline')
-        print(f"🔍 Found {len(headers)} products on the page")
+        # One selector sweep returns every header and its block parts in document order;
+        # everything after an h2.underline belongs to it until the next h2.underline
+        blocks = []
+        for element in main_content.select(PRODUCT_BLOCK_SELECTOR):
+            if element.name == 'h2':
+                blocks.append({'header': element, 'image': None, 'description': None, 'attributes': None})
+                continue
+            block = blocks[-1]
+            classes = element.get('class') or []
+            for part in ('image', 'description', 'attributes'):
+                if part in classes and block[part] is None:
+                    block[part] = element
+                    break
+        logger.info("🔍 Found %d products on the page", len(blocks))
         
-        for header in headers:
+        for block in blocks:
             try:
-                # Get product name
-                header_copy = header.__copy__()
-                name_element = header_copy.find('a')
-                if name_element:
-                    name_element.extract()
-                name = header_copy.get_text(strip=True)
+                header = block['header']
+                image_div = block['image']
+                description_div = block['description']
+                attributes_dl = block['attributes']
+                
+                # Get product name (header text without the link, no subtree copy)
+                name_element = header.find('a')
+                link_strings = {id(text) for text in name_element.strings} if name_element else ()
+                name = ''.join(
+                    text.strip() for text in header.strings
+                    if id(text) not in link_strings
+                )
                 
                 if not name:
                     continue
                 
                 # Get image URL
-                image_div = header.find_next_sibling('div', class_='image')
                 pic_url = ''
                 if image_div:
                     link = image_div.find('a')
@@ -281,23 +470,22 @@ class Product_into_db:
                         pic_url = link['href']
                 
                 # Get description (original text for Gemini)
-                description_div = header.find_next_sibling('div', class_='description')
                 description = ''
                 if description_div:
                     description = description_div.get_text(separator=' ', strip=True)
                 
                 # Get price
-                attributes_dl = header.find_next_sibling('dl', class_='attributes')
                 price = ''
                 if attributes_dl:
-                    price_dt = attributes_dl.find('dt', string=lambda text: text and 'Preis' in text)
-                    if price_dt:
-                        price_dd = price_dt.find_next_sibling('dd')
-                        if price_dd:
-                            price = price_dd.get_text(strip=True)
+                    for price_dt in attributes_dl.find_all('dt'):
+                        if 'Preis' in price_dt.get_text():
+                            price_dd = price_dt.find_next_sibling('dd')
+                            if price_dd:
+                                price = price_dd.get_text(strip=True)
+                            break
                 
                 # Sizes will be analyzed by yonex_site_checker.py, not here
-                sizes_json = json.dumps({"available": [], "sold_out": [], "note": "Size analysis pending"})
+                sizes_json = PENDING_SIZES_JSON
                 
                 # Create product object
                 product = Product(
@@ -311,19 +499,27 @@ class Product_into_db:
                 products.append(product)
                 
             except Exception as e:
-                print(f"⚠️ Error processing product: {e}")
+                logger.warning("⚠️ Error processing product: %s", e)
                 continue
         
-        print(f"📦 Successfully processed {len(products)} products with size analysis")
+        logger.info("📦 Successfully processed %d products with size analysis", len(products))
         return products
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Scrape a single Yonex category and store products in a database.")
-    parser.add_argument('--url', required=True, help='URL to scrape')
-    parser.add_argument('--category', required=True, help='Category name for database file')
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Scrape Yonex categories and store products in one database per category.")
+    parser.add_argument('--url', required=True, nargs='+', help='URL(s) to scrape')
+    parser.add_argument('--category', required=True, nargs='+', help='Category name(s) for the database files, one per URL')
     parser.add_argument('--insecure', action='store_true', 
                     help='Disable SSL certificate verification (USE ONLY IF YOU UNDERSTAND THE RISKS).')
     
     args = parser.parse_args()
     
-    Product_into_db.scrape_and_store(args.url, args.category, args.insecure)
\ No newline at end of file
+    if len(args.url) != len(args.category):
+        parser.error("--url and --category need the same number of values")
+    
+    if len(args.url) == 1:
+        Product_into_db.scrape_and_store(args.url[0], args.category[0], args.insecure)
+    else:
+        Product_into_db.scrape_and_store_many(args.url, args.category, args.insecure)
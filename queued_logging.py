@@ -0,0 +1,47 @@
+#shared logging setup for the checker and the telegram notifier
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+# Every module logs into one queue; a single listener thread does the actual writing, so worker
+# threads never contend on stdout. YONEX_LOG_FILE additionally writes a rotating log file.
+LOG_FILE_MAX_BYTES = 10_000_000
+LOG_FILE_BACKUPS = 3
+
+_log_queue = queue.SimpleQueue()
+_log_listener = None
+_listener_lock = threading.Lock()
+
+def _start_listener():
+    """Start the process-wide listener on first use (stopped and flushed at exit)."""
+    global _log_listener
+    with _listener_lock:
+        if _log_listener is not None:
+            return
+        stdout_handler = logging.StreamHandler(sys.stdout)
+        stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+        handlers = [stdout_handler]
+        log_file = os.getenv("YONEX_LOG_FILE")
+        if log_file:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding="utf-8"
+            )
+            file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+            handlers.append(file_handler)
+        _log_listener = logging.handlers.QueueListener(_log_queue, *handlers)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+
+def get_queued_logger(name: str, level_env: str) -> logging.Logger:
+    """Logger that writes through the shared queue, with its level taken from the level_env variable (default INFO)."""
+    _start_listener()
+    logger = logging.getLogger(name)
+    logger.setLevel(os.getenv(level_env, "INFO").upper())
+    logger.propagate = False
+    if not logger.handlers:
+        logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    return logger
@@ -7,7 +7,19 @@ import os
 import json
 import time
 import re
+import sqlite3
+import hashlib
+import unicodedata
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import orjson
 from openai import OpenAI
+from queued_logging import get_queued_logger
+
+# Provider and retry messages share the site checker's logging queue and YONEX_LOG_LEVEL
+logger = get_queued_logger(__name__, "YONEX_LOG_LEVEL")
 
 # Try to import Gemini, but make it optional
 try:
@@ -15,7 +27,7 @@ try:
     GEMINI_AVAILABLE = True
 except ImportError:
     GEMINI_AVAILABLE = False
-    print("⚠️ Google GenAI not installed. Gemini will not be available.")
+    logger.warning("⚠️ Google GenAI not installed. Gemini will not be available.")
 
 # API Keys (DO NOT hardcode secrets; set env vars instead)
 # Gemini: set GEMINI_API_KEY
@@ -46,10 +58,56 @@ AI_PROVIDERS = {
     }
 }
 
+# Concurrency limits for size analysis
+# AI_MAX_CONCURRENCY caps in-flight provider requests so batches stay inside the rate limits
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "4"))
+BATCH_MAX_WORKERS = 8
+# Descriptions per batched prompt; bigger batches get long answers that models start to garble
+SIZE_BATCH_MAX = 20
+_ai_slots = threading.BoundedSemaphore(AI_MAX_CONCURRENCY)
+
+# Descriptions shorter than this are sent to Qwen thinking models with thinking disabled
+QWEN_THINKING_MIN_CHARS = 200
+
+QWEN_BASE_URL = "https://dashscope-intl.aliyuncs.com/compatible-mode/v1"
+
 # Current configuration
 _current_provider = "gemini"
 _current_model = AI_PROVIDERS["gemini"]["default"]
 
+# Provider clients, created on first use and then reused so their connection pools stay warm
+_gemini_client = None
+_qwen_client = None
+_client_lock = threading.Lock()
+
+# Size analysis cache: persistent table next to the product databases plus a small in-process LRU
+SIZE_CACHE_DB = Path(__file__).parent / 'yonex_data' / 'databases' / 'size_cache.db'
+SIZE_CACHE_MEMORY_ENTRIES = 4096
+_size_cache_conn = None
+_size_cache_lock = threading.Lock()
+_size_cache_memory = OrderedDict()
+
+_RETRY_DELAY_RE = re.compile(r"retryDelay[^0-9]*?(\d+)", re.IGNORECASE)
+_FENCE_RE = re.compile(r"^```(?:json)?[ \t]*$", re.MULTILINE)
+
+# Local size parsing for the regular "Grössen <list> (=annotation)" format (see _local_size_parse)
+CLOTHING_SIZE_ORDER = ["XS", "S", "M", "L", "XL", "XXL", "XXXL", "2XL", "3XL"]
+MAX_RANGE_STEPS = 30
+_SIZE_KEYWORD_RE = re.compile(r"gr(?:ö|oe|o)(?:ss|ß)en", re.IGNORECASE)
+_ANNOTATION_RE = re.compile(
+    r"\(\s*=?\s*(?:nur\s+)?(komplett|ausverkauft)(?:\s+in\s+([^)]*?))?\s*\)",
+    re.IGNORECASE
+)
+_DECIMAL_COMMA_RE = re.compile(r"(?<=\d),(?=5(?!\d))")
+_SIZE_ITEM_SPLIT_RE = re.compile(r"[,/;]|\bund\b", re.IGNORECASE)
+_SIZE_RANGE_RE = re.compile(r"^(\S+?)\s*(?:-|–|\bbis\b)\s*(\S+)$", re.IGNORECASE)
+_NUMERIC_SIZE_RE = re.compile(r"^\d+(?:\.\d+)?$")
+
+# Cache key normalization (see _normalize_for_cache)
+_CACHE_DASH_RE = re.compile(r"[‐‑‒–—]")
+_CACHE_PUNCT_SPACE_RE = re.compile(r"\s*([,/;:()=\-])\s*")
+_CACHE_SPACE_RE = re.compile(r"\s+")
+
 
 def set_ai_provider(provider: str, model_key: str = None):
     """Set the AI provider and optionally a specific model."""
@@ -71,7 +129,7 @@ def set_ai_provider(provider: str, model_key: str = None):
     else:
         _current_model = AI_PROVIDERS[provider]["default"]
     
-    print(f"🤖 AI Provider: {_current_provider.upper()}, Model: {_current_model}")
+    logger.info("🤖 AI Provider: %s, Model: %s", _current_provider.upper(), _current_model)
 
 
 def get_current_config():
@@ -79,9 +137,35 @@ def get_current_config():
     return {"provider": _current_provider, "model": _current_model}
 
 
-def _build_size_prompt(description: str) -> str:
-    """Build the prompt for size analysis."""
-    return f"""You are given a product size description written in German.
+def _get_gemini_client():
+    """Return the shared Gemini client, creating it on first use."""
+    global _gemini_client
+    with _client_lock:
+        if _gemini_client is None:
+            _gemini_client = genai.Client(api_key=GEMINI_API_KEY)
+        return _gemini_client
+
+
+def _get_qwen_client():
+    """Return the shared Qwen (DashScope OpenAI-compatible) client, creating it on first use."""
+    global _qwen_client
+    with _client_lock:
+        if _qwen_client is None:
+            import httpx
+            http_client = httpx.Client(
+                proxy=None,
+                limits=httpx.Limits(max_keepalive_connections=8),
+            )
+            _qwen_client = OpenAI(
+                base_url=QWEN_BASE_URL,
+                api_key=QWEN_API_KEY,
+                http_client=http_client,
+            )
+        return _qwen_client
+
+
+# Instructions and examples shared by the single and the batch size prompt
+SIZE_PROMPT_RULES = """You are given a product size description written in German.
 Task: extract all sizes from the text (shoe sizes, clothing sizes, kids sizes) and determine which are available and which are sold out, based on any annotations in the text (e.g., "(=nur ausverkauft in 46)", "(=komplett)", "(=ausverkauft)").
 
 Rules (apply in order):
@@ -102,36 +186,53 @@ Rules (apply in order):
 - If the text contains "ausverkauft" without specific sizes (e.g. "(=ausverkauft)"), treat it as **all listed sizes are sold out**: available=[], sold_out=[all sizes].
 - If both "komplett" and explicit sold-out sizes appear, explicit sold-out sizes take precedence.
 5. Output EXACTLY one line of valid JSON. No line breaks, no indentation, no extra text. The format must be:
-{{"available":["...","..."],"sold_out":["...","..."]}}
+{"available":["...","..."],"sold_out":["...","..."]}
 
 Examples:
 
 Input: "Grössen 39.5, 40, 40.5, 41, 42, 43, 44, 44.5, 45, 45.5, 47   (=nur ausverkauft in 46)"
-Output: {{"available":["39.5","40","40.5","41","42","43","44","44.5","45","45.5","47"],"sold_out":["46"]}}
+Output: {"available":["39.5","40","40.5","41","42","43","44","44.5","45","45.5","47"],"sold_out":["46"]}
 
 Input: "in den Grössen 36/37/37.5/38/39/39.5/40/40.5/41/42   (=komplett)"
-Output: {{"available":["36","37","37.5","38","39","39.5","40","40.5","41","42"],"sold_out":[]}}
+Output: {"available":["36","37","37.5","38","39","39.5","40","40.5","41","42"],"sold_out":[]}
 
 Input: "Kindergrössen 120, 130, 140   (=ausverkauft)"
-Output: {{"available":[],"sold_out":["120","130","140"]}}
+Output: {"available":[],"sold_out":["120","130","140"]}
 
 Input: "in den Grössen S, M, L, XL, XXL   (=nur ausverkauft in L)"
-Output: {{"available":["S","M","XL","XXL"],"sold_out":["L"]}}
+Output: {"available":["S","M","XL","XXL"],"sold_out":["L"]}
 
 Input: "78% Polyester, 22% Modal (Cellulose) S-XXL (ausverkauft in XL)"
-Output: {{"available":["S","M","L","XXL"],"sold_out":["XL"]}}
+Output: {"available":["S","M","L","XXL"],"sold_out":["XL"]}"""
+
+
+def _build_size_prompt(description: str) -> str:
+    """Build the prompt for size analysis."""
+    return f"""{SIZE_PROMPT_RULES}
 
 Now process the following input and return only the JSON in this compact one-line format:
 [{description}]"""
 
 
-def _send_to_gemini(prompt: str) -> dict:
-    """Send prompt to Gemini API."""
+def _build_batch_size_prompt(descriptions: list) -> str:
+    """Build one prompt that analyzes several descriptions at once."""
+    inputs = "\n".join(f"{index}: [{description}]" for index, description in enumerate(descriptions))
+    return f"""{SIZE_PROMPT_RULES}
+
+Now process each of the following {len(descriptions)} inputs. Instead of a single object, return EXACTLY one line holding a JSON array with one object per input, in the same order as the inputs (input 0 first):
+[{{"available":[...],"sold_out":[...]}},{{"available":[...],"sold_out":[...]}}]
+
+{inputs}"""
+
+
+def _send_to_gemini(prompt: str, parse=None) -> dict:
+    """Send prompt to Gemini API. parse turns the response text into the result (default: one JSON object)."""
+    parse = parse or _parse_json_response
     if not GEMINI_AVAILABLE:
         return {"available": [], "sold_out": [], "error": "Gemini not available (google-genai not installed)"}
     
     try:
-        client = genai.Client(api_key=GEMINI_API_KEY)
+        client = _get_gemini_client()
         
         max_retries = 3
         for attempt in range(max_retries):
@@ -139,30 +240,30 @@ def _send_to_gemini(prompt: str) -> dict:
                 response = client.models.generate_content(
                     model=_current_model, contents=prompt
                 )
-                return _parse_json_response(response.text)
+                return parse(response.text)
                 
             except Exception as api_error:
                 error_str = str(api_error)
-                print(f"⚠️ Gemini API Error: {error_str[:300]}...") if len(error_str) > 300 else print(f"⚠️ Gemini API Error: {error_str}")
+                logger.warning("⚠️ Gemini API Error: %s%s", error_str[:300], "..." if len(error_str) > 300 else "")
                 
                 # Check for rate limit / retry delay
                 if 'retryDelay' in error_str or 'RESOURCE_EXHAUSTED' in error_str or '429' in error_str:
-                    delay_match = re.search(r"retryDelay[^0-9]*?(\d+)", error_str, re.IGNORECASE)
+                    delay_match = _RETRY_DELAY_RE.search(error_str)
                     if delay_match:
                         delay_seconds = int(delay_match.group(1))
-                        print(f"📊 Parsed delay from API: {delay_seconds}s")
+                        logger.info("📊 Parsed delay from API: %ss", delay_seconds)
                         delay_seconds = delay_seconds + 5  # Add buffer
                     else:
                         delay_seconds = 60
-                        print(f"📊 Could not parse delay, using default: {delay_seconds}s")
+                        logger.info("📊 Could not parse delay, using default: %ss", delay_seconds)
                     
                     delay_seconds = max(delay_seconds, 15)
                     
                     if attempt < max_retries - 1:
-                        print(f"⏳ Rate limited. Waiting {delay_seconds}s before retry (attempt {attempt + 1}/{max_retries})...")
+                        logger.info("⏳ Rate limited. Waiting %ss before retry (attempt %d/%d)...", delay_seconds, attempt + 1, max_retries)
                         time.sleep(delay_seconds)
                     else:
-                        print(f"⏳ Rate limited. Max retries ({max_retries}) exhausted.")
+                        logger.warning("⏳ Rate limited. Max retries (%d) exhausted.", max_retries)
                         return {"available": [], "sold_out": [], "error": f"Rate limited after {max_retries} attempts"}
                 else:
                     raise
@@ -170,27 +271,27 @@ def _send_to_gemini(prompt: str) -> dict:
         return {"available": [], "sold_out": [], "error": "Max retries exceeded"}
         
     except Exception as e:
-        print(f"⚠️ Error communicating with Gemini API: {e}")
+        logger.warning("⚠️ Error communicating with Gemini API: %s", e)
         return {"available": [], "sold_out": [], "error": str(e)}
 
 
-def _send_to_qwen(prompt: str) -> dict:
-    """Send prompt to Qwen API via Alibaba DashScope."""
+def _send_to_qwen(prompt: str, allow_thinking: bool = True, parse=None) -> dict:
+    """Send prompt to Qwen API via Alibaba DashScope.
+    
+    allow_thinking=False skips the streaming thinking mode even for thinking models.
+    parse turns the response text into the result (default: one JSON object).
+    """
+    parse = parse or _parse_json_response
     if not QWEN_API_KEY:
         return {"available": [], "sold_out": [], "error": "DASHSCOPE_API_KEY environment variable not set"}
     
     try:
-        import httpx
-        http_client = httpx.Client(proxy=None)
-        client = OpenAI(
-            base_url="https://dashscope-intl.aliyuncs.com/compatible-mode/v1",
-            api_key=QWEN_API_KEY,
-            http_client=http_client,
-        )
+        client = _get_qwen_client()
         
         # Check if this is a thinking model (like qwen-flash)
         thinking_models = AI_PROVIDERS["qwen"].get("thinking_models", [])
-        is_thinking_model = _current_model in thinking_models
+        supports_thinking = _current_model in thinking_models
+        is_thinking_model = allow_thinking and supports_thinking
         
         max_retries = 3
         for attempt in range(max_retries):
@@ -204,36 +305,37 @@ def _send_to_qwen(prompt: str) -> dict:
                         stream=True
                     )
                     
-                    # Collect the response from stream
-                    response_text = ""
+                    # Collect the response from stream (join once instead of repeated str +=)
+                    parts = []
                     for chunk in completion:
                         delta = chunk.choices[0].delta
                         if hasattr(delta, "content") and delta.content:
-                            response_text += delta.content
+                            parts.append(delta.content)
                     
-                    return _parse_json_response(response_text)
+                    return parse("".join(parts))
                 else:
-                    # Standard non-streaming request
+                    # Standard non-streaming request (thinking must be off explicitly for thinking models)
                     completion = client.chat.completions.create(
                         model=_current_model,
                         messages=[{"role": "user", "content": prompt}],
+                        extra_body={"enable_thinking": False} if supports_thinking else None,
                     )
                     
                     response_text = completion.choices[0].message.content
-                    return _parse_json_response(response_text)
+                    return parse(response_text)
                 
             except Exception as api_error:
                 error_str = str(api_error)
-                print(f"⚠️ Qwen API Error: {error_str[:300]}...") if len(error_str) > 300 else print(f"⚠️ Qwen API Error: {error_str}")
+                logger.warning("⚠️ Qwen API Error: %s%s", error_str[:300], "..." if len(error_str) > 300 else "")
                 
                 # Check for rate limit
                 if '429' in error_str or 'rate' in error_str.lower():
                     delay_seconds = 30
                     if attempt < max_retries - 1:
-                        print(f"⏳ Rate limited. Waiting {delay_seconds}s before retry (attempt {attempt + 1}/{max_retries})...")
+                        logger.info("⏳ Rate limited. Waiting %ss before retry (attempt %d/%d)...", delay_seconds, attempt + 1, max_retries)
                         time.sleep(delay_seconds)
                     else:
-                        print(f"⏳ Rate limited. Max retries ({max_retries}) exhausted.")
+                        logger.warning("⏳ Rate limited. Max retries (%d) exhausted.", max_retries)
                         return {"available": [], "sold_out": [], "error": f"Rate limited after {max_retries} attempts"}
                 else:
                     raise
@@ -241,34 +343,250 @@ def _send_to_qwen(prompt: str) -> dict:
         return {"available": [], "sold_out": [], "error": "Max retries exceeded"}
         
     except Exception as e:
-        print(f"⚠️ Error communicating with Qwen API: {e}")
+        logger.warning("⚠️ Error communicating with Qwen API: %s", e)
         return {"available": [], "sold_out": [], "error": str(e)}
 
 
+def _normalize_for_cache(description: str) -> str:
+    """Canonical form of a description: spelling variants that cannot change the sizes map to the same text."""
+    text = unicodedata.normalize("NFC", description).lower()
+    text = _DECIMAL_COMMA_RE.sub(".", text)
+    text = _CACHE_DASH_RE.sub("-", text)
+    text = _CACHE_PUNCT_SPACE_RE.sub(r"\1", text)
+    return _CACHE_SPACE_RE.sub(" ", text).strip()
+
+
+def _size_cache_key(description: str) -> str:
+    """Content hash of the normalized description, used as the size cache key."""
+    return hashlib.blake2b(_normalize_for_cache(description).encode(), digest_size=16).hexdigest()
+
+
+def _get_size_cache_conn():
+    """Return the shared size cache connection, creating the table on first use."""
+    global _size_cache_conn
+    if _size_cache_conn is None:
+        SIZE_CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(SIZE_CACHE_DB, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL").fetchall()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS sizes_cache (
+                desc_sha256 TEXT PRIMARY KEY,
+                result_json TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        _size_cache_conn = conn
+    return _size_cache_conn
+
+
+def _remember_size_result(key: str, result_json: str):
+    """Store a serialized result in the in-process LRU. Caller must hold _size_cache_lock."""
+    _size_cache_memory[key] = result_json
+    _size_cache_memory.move_to_end(key)
+    if len(_size_cache_memory) > SIZE_CACHE_MEMORY_ENTRIES:
+        _size_cache_memory.popitem(last=False)
+
+
+def _get_cached_sizes(key: str):
+    """Look up a previous result for this description hash, or None on a miss."""
+    with _size_cache_lock:
+        result_json = _size_cache_memory.get(key)
+        if result_json is not None:
+            _size_cache_memory.move_to_end(key)
+        else:
+            try:
+                row = _get_size_cache_conn().execute(
+                    "SELECT result_json FROM sizes_cache WHERE desc_sha256 = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("⚠️ Size cache lookup failed: %s", e)
+                return None
+            if row is None:
+                return None
+            result_json = row[0]
+            _remember_size_result(key, result_json)
+    # Each caller gets its own dict
+    return orjson.loads(result_json)
+
+
+def _store_cached_sizes(key: str, result: dict):
+    """Persist a successful result. Error responses are not cached so they get retried."""
+    if not isinstance(result, dict) or "error" in result:
+        return
+    result_json = orjson.dumps(result).decode()
+    with _size_cache_lock:
+        _remember_size_result(key, result_json)
+        try:
+            _get_size_cache_conn().execute(
+                "INSERT OR IGNORE INTO sizes_cache (desc_sha256, result_json) VALUES (?, ?)",
+                (key, result_json)
+            )
+        except sqlite3.Error as e:
+            logger.warning("⚠️ Size cache write failed: %s", e)
+
+
 def _parse_json_response(response_text: str) -> dict:
     """Parse JSON from AI response."""
-    response_text = response_text.strip()
-    
-    # Remove markdown code blocks if present
-    if response_text.startswith("```"):
-        lines = response_text.split("\n")
-        # Remove first and last line (```json and ```)
-        lines = [l for l in lines if not l.startswith("```")]
-        response_text = "\n".join(lines).strip()
+    # Remove markdown code fences if present
+    response_text = _FENCE_RE.sub("", response_text).strip()
     
-    # Extract JSON from response
-    if '{' in response_text and '}' in response_text:
+    # Fast path: the prompt asks for exactly one line of JSON
+    if response_text.startswith('{') and response_text.endswith('}'):
+        json_text = response_text
+    elif '{' in response_text and '}' in response_text:
+        # Extract JSON from surrounding text
         json_start = response_text.find('{')
         json_end = response_text.rfind('}') + 1
         json_text = response_text[json_start:json_end]
-        
-        try:
-            size_info = json.loads(json_text)
-            return size_info
-        except json.JSONDecodeError as e:
-            return {"available": [], "sold_out": [], "error": f"JSON parse error: {e}"}
     else:
         return {"available": [], "sold_out": [], "error": "Invalid JSON response"}
+    
+    try:
+        return orjson.loads(json_text)
+    except orjson.JSONDecodeError as e:
+        return {"available": [], "sold_out": [], "error": f"JSON parse error: {e}"}
+
+
+def _parse_json_array_response(response_text: str):
+    """Parse the JSON array of a batch response. Returns None if the output is unusable."""
+    response_text = _FENCE_RE.sub("", response_text).strip()
+    
+    json_start = response_text.find('[')
+    json_end = response_text.rfind(']') + 1
+    if json_start == -1 or json_end == 0:
+        return None
+    
+    try:
+        results = orjson.loads(response_text[json_start:json_end])
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(results, list) or not all(isinstance(result, dict) for result in results):
+        return None
+    return results
+
+
+def _parse_size_token(token: str):
+    """Return the normalized size for a single token, or None if it is not a size."""
+    if _NUMERIC_SIZE_RE.match(token):
+        return token
+    token = token.upper()
+    return token if token in CLOTHING_SIZE_ORDER else None
+
+
+def _parse_size_list(text: str):
+    """
+    Parse a size list such as "36/37/37.5", "S-XXL" or "41-43, 44 bis 46".
+    
+    Returns the list of sizes, or None if any part is not clearly a size.
+    """
+    text = _DECIMAL_COMMA_RE.sub(".", text)
+    sizes = []
+    for item in _SIZE_ITEM_SPLIT_RE.split(text):
+        item = item.strip()
+        if not item:
+            continue
+        
+        range_match = _SIZE_RANGE_RE.match(item)
+        if range_match:
+            start = _parse_size_token(range_match.group(1))
+            end = _parse_size_token(range_match.group(2))
+            if start is None or end is None:
+                return None
+            if start.isdigit() and end.isdigit() and 0 < int(end) - int(start) <= MAX_RANGE_STEPS:
+                sizes.extend(str(n) for n in range(int(start), int(end) + 1))
+            elif start in CLOTHING_SIZE_ORDER and end in CLOTHING_SIZE_ORDER \
+                    and CLOTHING_SIZE_ORDER.index(start) < CLOTHING_SIZE_ORDER.index(end):
+                sizes.extend(CLOTHING_SIZE_ORDER[CLOTHING_SIZE_ORDER.index(start):CLOTHING_SIZE_ORDER.index(end) + 1])
+            else:
+                return None  # Half-size or mixed ranges are left to the AI
+            continue
+        
+        for token in item.split():
+            size = _parse_size_token(token)
+            if size is None:
+                return None
+            sizes.append(size)
+    return sizes
+
+
+def _sort_sizes(sizes) -> list:
+    """Deduplicate and sort sizes: numeric ascending first, then clothing sizes in logical order."""
+    numeric = sorted({s for s in sizes if _NUMERIC_SIZE_RE.match(s)}, key=float)
+    clothing = sorted({s for s in sizes if s in CLOTHING_SIZE_ORDER}, key=CLOTHING_SIZE_ORDER.index)
+    return numeric + clothing
+
+
+def _local_size_parse(description: str):
+    """
+    Resolve the common description format without an AI call.
+    
+    Handles a "Grössen <list>" segment followed by exactly one "(=komplett)",
+    "(=ausverkauft)" or "(=nur ausverkauft in <list>)" annotation, applying the
+    same rules as the AI prompt.
+    
+    Returns:
+        dict with 'available' and 'sold_out' lists, or None if the text is not
+        unambiguous and should go to the AI provider
+    """
+    annotations = list(_ANNOTATION_RE.finditer(description))
+    if len(annotations) != 1:
+        return None
+    annotation = annotations[0]
+    
+    # The size list is everything between the last "Grössen" keyword and the annotation
+    keywords = list(_SIZE_KEYWORD_RE.finditer(description, 0, annotation.start()))
+    if not keywords:
+        return None
+    listed = _parse_size_list(description[keywords[-1].end():annotation.start()].lstrip(" :"))
+    if not listed:
+        return None
+    
+    status = annotation.group(1).lower()
+    sold_out_text = annotation.group(2)
+    if status == "komplett":
+        if sold_out_text:
+            return None
+        return {"available": _sort_sizes(listed), "sold_out": []}
+    if not sold_out_text:
+        return {"available": [], "sold_out": _sort_sizes(listed)}
+    
+    sold_out = _parse_size_list(sold_out_text)
+    if not sold_out:
+        return None
+    return {
+        "available": _sort_sizes(set(listed) - set(sold_out)),
+        "sold_out": _sort_sizes(sold_out),
+    }
+
+
+def _resolve_without_ai(description: str):
+    """Answer from the local parser or the cache; None means the AI has to be asked."""
+    if not description:
+        return {"available": [], "sold_out": [], "error": "No description provided"}
+    
+    # Most descriptions follow a regular format that can be resolved without a network round-trip
+    local_result = _local_size_parse(description)
+    if local_result is not None:
+        return local_result
+    
+    # Descriptions repeat a lot across categories and runs; reuse earlier AI answers
+    return _get_cached_sizes(_size_cache_key(description))
+
+
+def _ask_provider(prompt: str, use_thinking: bool, parse=None):
+    """Send a prompt to the configured provider, bounded by AI_MAX_CONCURRENCY."""
+    with _ai_slots:
+        if _current_provider == "gemini":
+            return _send_to_gemini(prompt, parse)
+        elif _current_provider == "qwen":
+            # Short descriptions don't need the (slow) reasoning pass; fall back to it on a bad answer
+            result = _send_to_qwen(prompt, allow_thinking=use_thinking, parse=parse)
+            failed = result is None or (isinstance(result, dict) and "error" in result)
+            if not use_thinking and failed and _current_model in AI_PROVIDERS["qwen"].get("thinking_models", []):
+                result = _send_to_qwen(prompt, parse=parse)
+            return result
+        else:
+            return {"available": [], "sold_out": [], "error": f"Unknown provider: {_current_provider}"}
 
 
 def analyze_sizes(description: str) -> dict:
@@ -281,17 +599,74 @@ def analyze_sizes(description: str) -> dict:
     Returns:
         dict with 'available' and 'sold_out' lists
     """
-    if not description:
-        return {"available": [], "sold_out": [], "error": "No description provided"}
+    result = _resolve_without_ai(description)
+    if result is not None:
+        return result
     
     prompt = _build_size_prompt(description)
+    result = _ask_provider(prompt, use_thinking=len(description) >= QWEN_THINKING_MIN_CHARS)
     
-    if _current_provider == "gemini":
-        return _send_to_gemini(prompt)
-    elif _current_provider == "qwen":
-        return _send_to_qwen(prompt)
-    else:
-        return {"available": [], "sold_out": [], "error": f"Unknown provider: {_current_provider}"}
+    _store_cached_sizes(_size_cache_key(description), result)
+    return result
+
+
+def _analyze_sizes_chunk(descriptions: list) -> list:
+    """Analyze up to SIZE_BATCH_MAX descriptions with a single AI request."""
+    if len(descriptions) == 1:
+        return [analyze_sizes(descriptions[0])]
+    
+    prompt = _build_batch_size_prompt(descriptions)
+    use_thinking = max(len(description) for description in descriptions) >= QWEN_THINKING_MIN_CHARS
+    results = _ask_provider(prompt, use_thinking, parse=_parse_json_array_response)
+    
+    if isinstance(results, dict):
+        # The request itself failed (rate limit, API error); don't multiply it by re-asking per item
+        return [dict(results) for _ in descriptions]
+    if results is None or len(results) != len(descriptions):
+        logger.warning("⚠️ Batch size analysis returned unusable output, analyzing %d descriptions one by one", len(descriptions))
+        return [analyze_sizes(description) for description in descriptions]
+    
+    for description, result in zip(descriptions, results):
+        _store_cached_sizes(_size_cache_key(description), result)
+    return results
+
+
+def analyze_sizes_batch(descriptions: list) -> list:
+    """
+    Analyze many product descriptions with as few AI requests as possible.
+    
+    Descriptions that the local parser or the cache can answer never reach the AI; the rest
+    are deduplicated (by cache key) and sent SIZE_BATCH_MAX at a time in one prompt each, concurrently.
+    
+    Args:
+        descriptions: Product description texts (in German)
+    
+    Returns:
+        list of size dicts, in the same order as descriptions
+    """
+    results = [None] * len(descriptions)
+    pending = {}  # cache key -> (description, positions in descriptions)
+    for index, description in enumerate(descriptions):
+        result = _resolve_without_ai(description)
+        if result is not None:
+            results[index] = result
+        else:
+            pending.setdefault(_size_cache_key(description), (description, []))[1].append(index)
+    
+    if pending:
+        unique = [description for description, _ in pending.values()]
+        positions = [indexes for _, indexes in pending.values()]
+        chunks = [unique[start:start + SIZE_BATCH_MAX] for start in range(0, len(unique), SIZE_BATCH_MAX)]
+        logger.info("🧠 Asking AI about %d descriptions in %d request(s)...", len(unique), len(chunks))
+        
+        # Requests are network-bound; _ask_provider bounds how many run at once
+        with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(chunks))) as executor:
+            chunk_results = [result for results_of_chunk in executor.map(_analyze_sizes_chunk, chunks) for result in results_of_chunk]
+        for indexes, result in zip(positions, chunk_results):
+            for index in indexes:
+                results[index] = dict(result)
+    
+    return results
 
 
 # For backwards compatibility
@@ -315,6 +690,6 @@ if __name__ == "__main__":
     
     test_description = args.test or "Grössen 39.5, 40, 40.5, 41, 42, 43, 44, 44.5, 45, 45.5, 47 (=nur ausverkauft in 46)"
     
-    print(f"\n📝 Testing with: {test_description}")
+    logger.info("📝 Testing with: %s", test_description)
     result = analyze_sizes(test_description)
-    print(f"✅ Result: {json.dumps(result, indent=2)}")
+    logger.info("✅ Result: %s", json.dumps(result, indent=2))
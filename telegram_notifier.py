@@ -1,17 +1,185 @@
 #send a telegram message to users
+import sys
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import atexit
 import json
 import os
+import orjson
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Set
+from queued_logging import get_queued_logger
+
+# Diagnostics go through the shared logging queue (level via TELEGRAM_LOG_LEVEL)
+logger = get_queued_logger(__name__, "TELEGRAM_LOG_LEVEL")
 
 # Telegram Bot Configuration
 # Create a bot with @BotFather on Telegram and get your token
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
 TELEGRAM_API_URL = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}"
+SEND_MESSAGE_URL = f"{TELEGRAM_API_URL}/sendMessage"
+GET_UPDATES_URL = f"{TELEGRAM_API_URL}/getUpdates"
+
+# Broadcast fan-out: sends run in a thread pool over one pooled session (TLS connections are reused)
+SEND_MAX_WORKERS = 20
+# Telegram allows roughly 30 messages per second across all chats
+GLOBAL_MESSAGES_PER_SECOND = 30
+
+# One keep-alive connection per sender thread plus one for polling; pool_block makes extra requests
+# wait for a free connection instead of opening (and then throwing away) a new TLS connection.
+# Connection errors are retried here for every request. Read timeouts and 5xx answers are only
+# retried for GET (getUpdates): a sendMessage POST may already have been delivered by then.
+# 429 is left to the RateLimiter, so Retry-After is not honoured (and counted) a second time here.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[500, 502, 503, 504],
+    allowed_methods=["GET"],
+    respect_retry_after_header=False,
+    raise_on_status=False,
+)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1, pool_maxsize=SEND_MAX_WORKERS + 1, pool_block=True, max_retries=_RETRY
+))
+
+# Attempts per message when Telegram answers 429 Too Many Requests
+SEND_MAX_ATTEMPTS = 3
+
+
+class RateLimiter:
+    """Token bucket for Telegram's global message limit plus a minimum spacing per chat.
+    A 429 response pauses every sender until Telegram's retry_after has passed."""
+    
+    def __init__(self, rate: int = GLOBAL_MESSAGES_PER_SECOND, per_chat_interval: float = 1.0):
+        self.rate = rate
+        self.tokens = float(rate)
+        self.per_chat_interval = per_chat_interval
+        self.updated = time.monotonic()
+        self.pause_until = 0.0
+        self.last_sent = {}
+        self.lock = threading.Lock()
+    
+    def acquire(self, chat_id: int):
+        """Block until a message to chat_id may be sent."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                wait = max(
+                    self.pause_until - now,
+                    self.last_sent.get(chat_id, float('-inf')) + self.per_chat_interval - now,
+                )
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        self.last_sent[chat_id] = now
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    def pause(self, seconds: float):
+        """Hold back all senders for the given number of seconds."""
+        with self.lock:
+            self.pause_until = max(self.pause_until, time.monotonic() + seconds)
+
+
+_limiter = RateLimiter()
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+YONEX_CATEGORY_URL = "https://www.yonex.ch/de/badminton/produkte/{category}/"
+
+
+@lru_cache(maxsize=None)
+def _category_link(category: str, label: str) -> str:
+    """HTML link to a Yonex category page (a handful of categories, so built once each)."""
+    return f"🔗 <a href='{YONEX_CATEGORY_URL.format(category=category)}'>{label}</a>"
+
+
+def _encode_message_body(message: str, parse_mode: str = "HTML") -> bytes:
+    """Serialize a sendMessage body without chat_id (and without its opening brace)."""
+    return json.dumps({
+        "text": message,
+        "parse_mode": parse_mode,
+        "disable_web_page_preview": True
+    }).encode()[1:]
+
 
 # File to store subscriber chat IDs
 SUBSCRIBERS_FILE = Path(__file__).parent / 'telegram_subscribers.json'
+# The bot only reacts to text commands; other update types are not even delivered
+# (Telegram expects a JSON-serialized array in query parameters)
+ALLOWED_UPDATES = json.dumps(["message"])
+# Last processed getUpdates offset, so a restarted bot doesn't replay old commands
+OFFSET_FILE = Path(__file__).parent / 'telegram_offset.json'
+# Bursts of /start and /stop are written to disk once, this long after the first change
+SAVE_DEBOUNCE_SECONDS = 1.0
+
+# Parsed subscriber file ({'chat_ids': {...}, 'owner_id': ...}), shared by every Notifier
+_subscriber_data = None
+_subscriber_lock = threading.RLock()
+_subscribers_dirty = False
+_flush_timer = None
+
+
+def _get_subscriber_data() -> dict:
+    """Parse the subscriber file on first use and return the cached data afterwards."""
+    global _subscriber_data
+    with _subscriber_lock:
+        if _subscriber_data is None:
+            data = {'chat_ids': set(), 'owner_id': None}
+            if SUBSCRIBERS_FILE.exists():
+                try:
+                    loaded = orjson.loads(SUBSCRIBERS_FILE.read_bytes())
+                    data['chat_ids'] = set(loaded.get('chat_ids', []))
+                    data['owner_id'] = loaded.get('owner_id')
+                except Exception as e:
+                    logger.warning("⚠️ Error loading subscribers: %s", e)
+            _subscriber_data = data
+        return _subscriber_data
+
+
+def _flush_subscribers() -> bool:
+    """Write the subscriber file if it changed, via a temp file so a crash never leaves it half-written.
+    Returns False if the write failed (the changes stay pending)."""
+    global _subscribers_dirty, _flush_timer
+    with _subscriber_lock:
+        _flush_timer = None
+        if not _subscribers_dirty:
+            return True
+        _subscribers_dirty = False
+        data = {'chat_ids': sorted(_subscriber_data['chat_ids'])}
+        if _subscriber_data['owner_id']:
+            data['owner_id'] = _subscriber_data['owner_id']
+        try:
+            tmp_path = SUBSCRIBERS_FILE.with_name(SUBSCRIBERS_FILE.name + '.tmp')
+            # Indented so owner_id can still be set by hand
+            tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_path, SUBSCRIBERS_FILE)
+            return True
+        except Exception as e:
+            _subscribers_dirty = True
+            logger.warning("⚠️ Error saving subscribers: %s", e)
+            return False
+
+
+@atexit.register
+def flush_subscribers() -> bool:
+    """Write pending subscriber changes now instead of waiting for the debounce timer.
+    The timer and atexit do not survive a kill, so call this before acknowledging the changes
+    to anyone else. Returns False if the subscriber file could not be written."""
+    with _subscriber_lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+        return _flush_subscribers()
 
 
 class Notifier:
@@ -21,106 +189,126 @@ class Notifier:
         self.owner_id = None
         self.subscribers = self._load_subscribers()
     
-    def _load_subscribers(self) -> List[int]:
-        """Load subscriber chat IDs and owner from file."""
-        if SUBSCRIBERS_FILE.exists():
-            try:
-                with open(SUBSCRIBERS_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.owner_id = data.get('owner_id')
-                    return data.get('chat_ids', [])
-            except Exception as e:
-                print(f"⚠️ Error loading subscribers: {e}")
-        return []
+    def _load_subscribers(self) -> Set[int]:
+        """Load subscriber chat IDs and owner (parsed once per process, shared by every Notifier)."""
+        data = _get_subscriber_data()
+        self.owner_id = data['owner_id']
+        return data['chat_ids']
     
     def _save_subscribers(self):
-        """Save subscriber chat IDs and owner to file."""
-        try:
-            with open(SUBSCRIBERS_FILE, 'w') as f:
-                data = {'chat_ids': self.subscribers}
-                if self.owner_id:
-                    data['owner_id'] = self.owner_id
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"⚠️ Error saving subscribers: {e}")
+        """Mark the subscriber list as changed; it is written shortly after the last change."""
+        global _subscribers_dirty, _flush_timer
+        with _subscriber_lock:
+            _subscribers_dirty = True
+            if _flush_timer is None:
+                _flush_timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, _flush_subscribers)
+                _flush_timer.daemon = True
+                _flush_timer.start()
     
     def add_subscriber(self, chat_id: int) -> bool:
         """Add a new subscriber."""
-        if chat_id not in self.subscribers:
-            self.subscribers.append(chat_id)
+        with _subscriber_lock:
+            if chat_id in self.subscribers:
+                return False
+            self.subscribers.add(chat_id)
             self._save_subscribers()
             return True
-        return False
     
     def remove_subscriber(self, chat_id: int) -> bool:
         """Remove a subscriber."""
-        if chat_id in self.subscribers:
+        with _subscriber_lock:
+            if chat_id not in self.subscribers:
+                return False
             self.subscribers.remove(chat_id)
             self._save_subscribers()
             return True
-        return False
     
     def _send_telegram_message(self, chat_id: int, message: str, parse_mode: str = "HTML") -> bool:
         """Send a message to a specific chat ID."""
+        return self._send_encoded_message(chat_id, _encode_message_body(message, parse_mode))
+    
+    def _send_encoded_message(self, chat_id: int, encoded_body: bytes) -> bool:
+        """Send a message body from _encode_message_body to a specific chat ID."""
         try:
-            response = requests.post(
-                f"{TELEGRAM_API_URL}/sendMessage",
-                json={
-                    "chat_id": chat_id,
-                    "text": message,
-                    "parse_mode": parse_mode,
-                    "disable_web_page_preview": True
-                },
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                return True
-            else:
-                print(f"⚠️ Telegram API error for chat {chat_id}: {response.text}")
+            # json.dumps keeps string chat ids (e.g. an owner id read from the environment) valid JSON
+            payload = b'{"chat_id": ' + json.dumps(chat_id).encode() + b', ' + encoded_body
+            for attempt in range(SEND_MAX_ATTEMPTS):
+                _limiter.acquire(chat_id)
+                response = _SESSION.post(
+                    SEND_MESSAGE_URL,
+                    data=payload,
+                    headers=JSON_HEADERS,
+                    timeout=10
+                )
+                
+                if response.status_code == 200:
+                    return True
+                
+                if response.status_code == 429 and attempt < SEND_MAX_ATTEMPTS - 1:
+                    # Telegram says how long to back off; every sender waits that long
+                    try:
+                        retry_after = response.json().get('parameters', {}).get('retry_after', 1)
+                    except ValueError:
+                        retry_after = 1
+                    logger.info(
+                        "⏳ Telegram rate limit hit, pausing sends for %ss (attempt %d/%d)",
+                        retry_after, attempt + 1, SEND_MAX_ATTEMPTS
+                    )
+                    _limiter.pause(retry_after)
+                    continue
+                
+                logger.warning("⚠️ Telegram API error for chat %s: %s", chat_id, response.text)
                 return False
+            
+            return False
                 
         except Exception as e:
-            print(f"⚠️ Error sending Telegram message to {chat_id}: {e}")
+            logger.warning("⚠️ Error sending Telegram message to %s: %s", chat_id, e)
             return False
     
     def send_error_to_owner(self, error_message: str) -> bool:
         """Send error notification only to the owner."""
         if not self.owner_id:
-            print("⚠️ No owner configured - cannot send error notification")
+            logger.warning("⚠️ No owner configured - cannot send error notification")
             return False
         
         message = f"🚨 <b>ERROR</b>\n\n{error_message}"
         success = self._send_telegram_message(self.owner_id, message)
         if success:
-            print(f"📱 Error sent to owner ({self.owner_id})")
+            logger.info("📱 Error sent to owner (%s)", self.owner_id)
         return success
     
     def send_notification(self, title: str, body: str, tag: str = "") -> int:
         """Send notification to all subscribers. Returns number of successful sends."""
         message = f"<b>{title}</b>\n\n{body}"
         
-        if not self.subscribers:
-            print("⚠️ No Telegram subscribers to notify")
+        # Snapshot under the lock: /start and /stop modify the set from the bot thread
+        with _subscriber_lock:
+            recipients = list(self.subscribers)
+        
+        if not recipients:
+            logger.warning("⚠️ No Telegram subscribers to notify")
             return 0
         
-        success_count = 0
-        for chat_id in self.subscribers:
-            if self._send_telegram_message(chat_id, message):
-                success_count += 1
+        # The JSON body is the same for everyone apart from chat_id, so it is serialized once
+        encoded_body = _encode_message_body(message)
         
-        print(f"📱 Telegram: Sent to {success_count}/{len(self.subscribers)} subscribers")
+        # Sends are network-bound, so they run concurrently; the rate budget is enforced per send
+        with ThreadPoolExecutor(max_workers=min(SEND_MAX_WORKERS, len(recipients))) as executor:
+            success_count = sum(executor.map(lambda chat_id: self._send_encoded_message(chat_id, encoded_body), recipients))
+        
+        logger.info("📱 Telegram: Sent to %d/%d subscribers", success_count, len(recipients))
         return success_count
     
     def notify_product_added(self, product_name: str, category: str, price: str = ""):
         """Notify about a new product."""
         title = f"🆕 New Product - {category.upper()}"
-        body = f"<b>{product_name}</b>"
+        parts = [f"<b>{product_name}</b>"]
         if price:
-            body += f"\n💰 Price: {price}"
-        body += f"\n\n🔗 <a href='https://www.yonex.ch/de/badminton/produkte/{category}/'>View on Yonex.ch</a>"
+            parts.append(f"\n💰 Price: {price}")
+        parts.append(f"\n\n{_category_link(category, 'View on Yonex.ch')}")
         
-        self.send_notification(title, body, "product-added")
+        self.send_notification(title, "".join(parts), "product-added")
     
     def notify_product_removed(self, product_name: str, category: str):
         """Notify about a removed product."""
@@ -132,9 +320,7 @@ class Notifier:
     def notify_price_change(self, product_name: str, old_price: str, new_price: str, category: str):
         """Notify about a price change."""
         title = f"💰 Price Change - {category.upper()}"
-        body = f"<b>{product_name}</b>\n\n"
-        body += f"❌ Old: {old_price}\n"
-        body += f"✅ New: {new_price}"
+        body = f"<b>{product_name}</b>\n\n❌ Old: {old_price}\n✅ New: {new_price}"
         
         self.send_notification(title, body, "price-change")
     
@@ -143,51 +329,107 @@ class Notifier:
                            newly_sold_out: List[str] = None):
         """Notify about size availability changes."""
         title = f"📏 Size Update - {category.upper()}"
-        body = f"<b>{product_name}</b>\n\n"
+        parts = [f"<b>{product_name}</b>\n\n"]
         
         if newly_available:
-            body += f"✅ Now Available: {', '.join(newly_available)}\n"
+            parts.append(f"✅ Now Available: {', '.join(newly_available)}\n")
         if newly_sold_out:
-            body += f"❌ Now Sold Out: {', '.join(newly_sold_out)}\n"
+            parts.append(f"❌ Now Sold Out: {', '.join(newly_sold_out)}\n")
         
-        body += f"\n🔗 <a href='https://www.yonex.ch/de/badminton/produkte/{category}/'>Check on Yonex.ch</a>"
+        parts.append(f"\n{_category_link(category, 'Check on Yonex.ch')}")
         
-        self.send_notification(title, body, "size-change")
+        self.send_notification(title, "".join(parts), "size-change")
     
     def notify_description_change(self, product_name: str, category: str):
         """Notify about a description change."""
         title = f"📝 Description Updated - {category.upper()}"
-        body = f"<b>{product_name}</b> description has been updated."
-        body += f"\n\n🔗 <a href='https://www.yonex.ch/de/badminton/produkte/{category}/'>View on Yonex.ch</a>"
+        body = f"<b>{product_name}</b> description has been updated.\n\n{_category_link(category, 'View on Yonex.ch')}"
         
         self.send_notification(title, body, "description-change")
 
 
+def _load_last_update_id() -> int:
+    """Read the last processed update ID (0 if the bot never ran)."""
+    if OFFSET_FILE.exists():
+        try:
+            return int(orjson.loads(OFFSET_FILE.read_bytes()).get('last_update_id', 0))
+        except Exception as e:
+            logger.warning("⚠️ Error loading Telegram offset: %s", e)
+    return 0
+
+
+def _save_last_update_id(last_update_id: int):
+    """Persist the last processed update ID atomically."""
+    try:
+        tmp_path = OFFSET_FILE.with_name(OFFSET_FILE.name + '.tmp')
+        tmp_path.write_bytes(orjson.dumps({'last_update_id': last_update_id}))
+        os.replace(tmp_path, OFFSET_FILE)
+    except Exception as e:
+        logger.warning("⚠️ Error saving Telegram offset: %s", e)
+
+
+def _handle_start(notifier: Notifier, chat_id: int) -> str:
+    """Subscribe the chat and return the reply text."""
+    if notifier.add_subscriber(chat_id):
+        return "✅ <b>Subscribed!</b>\n\nYou'll receive notifications when Yonex products change.\n\nUse /stop to unsubscribe."
+    return "ℹ️ You're already subscribed!\n\nUse /stop to unsubscribe."
+
+
+def _handle_stop(notifier: Notifier, chat_id: int) -> str:
+    """Unsubscribe the chat and return the reply text."""
+    if notifier.remove_subscriber(chat_id):
+        return "👋 <b>Unsubscribed.</b>\n\nYou won't receive any more notifications.\n\nUse /start to subscribe again."
+    return "ℹ️ You're not subscribed.\n\nUse /start to subscribe."
+
+
+def _handle_status(notifier: Notifier, chat_id: int) -> str:
+    """Return the bot status reply text."""
+    count = len(notifier.subscribers)
+    return f"📊 <b>Bot Status</b>\n\n👥 Subscribers: {count}\n✅ Bot is running"
+
+
+# Bot commands -> handler returning the reply text
+COMMAND_HANDLERS = {
+    '/start': _handle_start,
+    '/stop': _handle_stop,
+    '/status': _handle_status,
+}
+
+
 def start_telegram_bot():
     """
     Simple polling bot to handle /start and /stop commands.
     Run this separately or in a thread to manage subscriptions.
     """
     notifier = Notifier()
-    last_update_id = 0
+    last_update_id = _load_last_update_id()
     
-    print("🤖 Telegram bot started. Waiting for commands...")
+    # Replies are sent in the background so a slow sendMessage never delays the next getUpdates;
+    # subscriber changes still happen in order on the polling thread
+    reply_pool = ThreadPoolExecutor(max_workers=SEND_MAX_WORKERS)
+    
+    def send_reply(chat_id: int, text: str):
+        reply_pool.submit(notifier._send_telegram_message, chat_id, text)
+    
+    logger.info("🤖 Telegram bot started. Waiting for commands...")
     
     while True:
         try:
-            response = requests.get(
-                f"{TELEGRAM_API_URL}/getUpdates",
-                params={"offset": last_update_id + 1, "timeout": 30},
+            response = _SESSION.get(
+                GET_UPDATES_URL,
+                params={"offset": last_update_id + 1, "timeout": 30, "allowed_updates": ALLOWED_UPDATES},
                 timeout=35
             )
             
             if response.status_code != 200:
                 continue
             
-            updates = response.json().get('result', [])
+            # orjson parses the raw body directly, without requests' charset detection and stdlib json
+            updates = orjson.loads(response.content).get('result', [])
             
+            batch_last_id = last_update_id
             for update in updates:
-                last_update_id = update['update_id']
+                batch_last_id = update['update_id']
                 message = update.get('message', {})
                 chat_id = message.get('chat', {}).get('id')
                 text = message.get('text', '')
@@ -195,42 +437,24 @@ def start_telegram_bot():
                 if not chat_id:
                     continue
                 
-                if text == '/start':
-                    if notifier.add_subscriber(chat_id):
-                        notifier._send_telegram_message(
-                            chat_id,
-                            "✅ <b>Subscribed!</b>\n\nYou'll receive notifications when Yonex products change.\n\nUse /stop to unsubscribe."
-                        )
-                    else:
-                        notifier._send_telegram_message(
-                            chat_id,
-                            "ℹ️ You're already subscribed!\n\nUse /stop to unsubscribe."
-                        )
-                
-                elif text == '/stop':
-                    if notifier.remove_subscriber(chat_id):
-                        notifier._send_telegram_message(
-                            chat_id,
-                            "👋 <b>Unsubscribed.</b>\n\nYou won't receive any more notifications.\n\nUse /start to subscribe again."
-                        )
-                    else:
-                        notifier._send_telegram_message(
-                            chat_id,
-                            "ℹ️ You're not subscribed.\n\nUse /start to subscribe."
-                        )
-                
-                elif text == '/status':
-                    count = len(notifier.subscribers)
-                    notifier._send_telegram_message(
-                        chat_id,
-                        f"📊 <b>Bot Status</b>\n\n👥 Subscribers: {count}\n✅ Bot is running"
-                    )
+                handler = COMMAND_HANDLERS.get(text)
+                if handler:
+                    send_reply(chat_id, handler(notifier, chat_id))
+            if not updates:
+                continue
+            # Polling past (or saving) the offset tells Telegram these updates are consumed, so the
+            # subscriber changes they caused go to disk first. If that write fails the offset stays
+            # put and the batch is fetched and applied again.
+            if not flush_subscribers():
+                time.sleep(5)
+                continue
+            last_update_id = batch_last_id
+            _save_last_update_id(last_update_id)
         
         except requests.exceptions.Timeout:
             continue
         except Exception as e:
-            print(f"⚠️ Telegram bot error: {e}")
-            import time
+            logger.warning("⚠️ Telegram bot error: %s", e)
             time.sleep(5)
 
 
@@ -238,13 +462,13 @@ def test_error():
     """Test function to simulate an error notification to owner."""
     notifier = Notifier()
     
-    print("=" * 50)
-    print("🧪 TEST ERROR - Sending to Owner")
-    print("=" * 50)
-    print(f"👤 Owner ID: {notifier.owner_id}")
+    logger.info("=" * 50)
+    logger.info("🧪 TEST ERROR - Sending to Owner")
+    logger.info("=" * 50)
+    logger.info("👤 Owner ID: %s", notifier.owner_id)
     
     if not notifier.owner_id:
-        print("❌ No owner configured! Set owner_id in telegram_subscribers.json")
+        logger.error("❌ No owner configured! Set owner_id in telegram_subscribers.json")
         return
     
     error_message = """Test error from yonex_site_checker.py
@@ -256,26 +480,26 @@ Details: Failed to fetch https://www.yonex.ch/de/badminton/produkte/bekleidung/
 This is a TEST error notification.
 Timestamp: 2025-12-23 12:00:00"""
 
-    print("\n📤 Sending test error to owner...")
+    logger.info("📤 Sending test error to owner...")
     success = notifier.send_error_to_owner(error_message)
     
     if success:
-        print("✅ Test error sent successfully!")
+        logger.info("✅ Test error sent successfully!")
     else:
-        print("❌ Failed to send test error")
+        logger.error("❌ Failed to send test error")
 
 
 def test_notification():
     """Test function to simulate a product change notification."""
     notifier = Notifier()
     
-    print("=" * 50)
-    print("🧪 TEST MODE - Simulating Product Changes")
-    print("=" * 50)
-    print(f"📱 Subscribers: {len(notifier.subscribers)}")
+    logger.info("=" * 50)
+    logger.info("🧪 TEST MODE - Simulating Product Changes")
+    logger.info("=" * 50)
+    logger.info("📱 Subscribers: %s", len(notifier.subscribers))
     
     if not notifier.subscribers:
-        print("❌ No subscribers! Use /start in Telegram first.")
+        logger.error("❌ No subscribers! Use /start in Telegram first.")
         return
     
     # Simulate a full change notification (like the real one)
@@ -309,19 +533,17 @@ MODIFIED #1 - Image: /test/shoe.jpg
 End of changes for TEST at 2025-12-23 12:00:00
 =================================================="""
 
-    print("\n📤 Sending test notification...")
+    logger.info("📤 Sending test notification...")
     success = notifier.send_notification(
         title="🧪 TEST - Yonex Product Update",
         body=test_message,
         tag="test"
     )
     
-    print(f"\n✅ Test complete! Sent to {success} subscriber(s)")
+    logger.info("✅ Test complete! Sent to %s subscriber(s)", success)
 
 
 if __name__ == "__main__":
-    import sys
-    
     # Check for test mode
     if len(sys.argv) > 1 and sys.argv[1] == "--test":
         test_notification()
@@ -331,24 +553,24 @@ if __name__ == "__main__":
         test_error()
         sys.exit(0)
     
-    print("=" * 50)
-    print("Yonex Telegram Notification Bot")
-    print("=" * 50)
-    print("\nTo use this bot:")
-    print("1. Create a bot with @BotFather on Telegram")
-    print("2. Replace TELEGRAM_BOT_TOKEN in this file")
-    print("3. Run this script to start the subscription bot")
-    print("\nCommands:")
-    print("  /start  - Subscribe to notifications")
-    print("  /stop   - Unsubscribe")
-    print("  /status - Check bot status")
-    print("\nTest mode:")
-    print("  python telegram_notifier.py --test        (test product notification)")
-    print("  python telegram_notifier.py --test-error  (test error to owner)")
-    print("=" * 50)
+    logger.info("=" * 50)
+    logger.info("Yonex Telegram Notification Bot")
+    logger.info("=" * 50)
+    logger.info("To use this bot:")
+    logger.info("1. Create a bot with @BotFather on Telegram")
+    logger.info("2. Replace TELEGRAM_BOT_TOKEN in this file")
+    logger.info("3. Run this script to start the subscription bot")
+    logger.info("Commands:")
+    logger.info("  /start  - Subscribe to notifications")
+    logger.info("  /stop   - Unsubscribe")
+    logger.info("  /status - Check bot status")
+    logger.info("Test mode:")
+    logger.info("  python telegram_notifier.py --test        (test product notification)")
+    logger.info("  python telegram_notifier.py --test-error  (test error to owner)")
+    logger.info("=" * 50)
     
     if TELEGRAM_BOT_TOKEN == "YOUR_BOT_TOKEN_HERE":
-        print("\n❌ ERROR: Please set your TELEGRAM_BOT_TOKEN first!")
+        logger.error("❌ ERROR: Please set your TELEGRAM_BOT_TOKEN first!")
     else:
         start_telegram_bot()
 
@@ -0,0 +1,86 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import products_into_db
+from products_into_db import PENDING_SIZES_JSON, Product, Product_into_db
+
+
+class StoreProductsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        db_dir = Path(tmp.name) / "databases"
+        patcher = mock.patch.object(products_into_db, "DB_DIR", db_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(products_into_db._close_connections)
+        self.db_path = db_dir / "schuhe_products.db"
+
+    def _rows(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT name, pic_url, price FROM products ORDER BY id").fetchall()
+
+    def test_products_sharing_an_image_are_merged_last_one_wins(self):
+        Product_into_db.store_products([
+            Product("Shoe A", "/img/shoe.jpg", "", "chf 100", PENDING_SIZES_JSON),
+            Product("Shoe B", "/img/shoe.jpg", "", "chf 120", PENDING_SIZES_JSON),
+            Product("Racket", "/img/racket.jpg", "", "chf 200", PENDING_SIZES_JSON),
+        ], "schuhe")
+        self.assertEqual(self._rows(), [
+            ("Shoe B", "/img/shoe.jpg", "chf 120"),
+            ("Racket", "/img/racket.jpg", "chf 200"),
+        ])
+
+    def test_products_without_image_are_kept_apart(self):
+        Product_into_db.store_products([
+            Product("Sock A", "", "", "chf 10", PENDING_SIZES_JSON),
+            Product("Sock B", "", "", "chf 12", PENDING_SIZES_JSON),
+        ], "schuhe")
+        self.assertEqual(self._rows(), [("Sock A", "", "chf 10"), ("Sock B", "", "chf 12")])
+
+    def test_restore_updates_in_place_and_drops_unlisted(self):
+        Product_into_db.store_products([
+            Product("Shoe", "/img/shoe.jpg", "", "chf 100", PENDING_SIZES_JSON),
+            Product("Bag", "/img/bag.jpg", "", "chf 50", PENDING_SIZES_JSON),
+        ], "schuhe")
+        Product_into_db.store_products([
+            Product("Shoe", "/img/shoe.jpg", "", "chf 90", PENDING_SIZES_JSON),
+        ], "schuhe")
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT id, name, price FROM products").fetchall()
+        self.assertEqual(rows, [(1, "Shoe", "chf 90")])
+
+
+class RebuildDatabaseTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(products_into_db._close_connections)
+        self.db_path = Path(tmp.name) / "schuhe_products.db"
+
+    @staticmethod
+    def _product(name, pic_url, price="chf 100"):
+        return {"name": name, "pic_url": pic_url, "description": "", "price": price, "sizes": "", "type": "schuhe"}
+
+    def test_rebuild_replaces_rows_with_sequential_ids(self):
+        Product_into_db.rebuild_database([self._product("Old", "/img/old.jpg")], self.db_path)
+        inserted = Product_into_db.rebuild_database([
+            self._product("Shoe", "/img/shoe.jpg"),
+            self._product("Sock", ""),
+            self._product("Shoe v2", "/img/shoe.jpg", "chf 90"),
+            self._product("Bag", "/img/bag.jpg"),
+        ], self.db_path)
+
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT id, name, price FROM products ORDER BY id").fetchall()
+            missing_last_seen = conn.execute("SELECT COUNT(*) FROM products WHERE last_seen IS NULL").fetchone()[0]
+        self.assertEqual(inserted, 3)
+        self.assertEqual(rows, [(1, "Shoe v2", "chf 90"), (2, "Sock", "chf 100"), (3, "Bag", "chf 100")])
+        self.assertEqual(missing_last_seen, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
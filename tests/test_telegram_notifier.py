@@ -0,0 +1,100 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import telegram_notifier
+
+
+class SendEncodedMessageTest(unittest.TestCase):
+    def _send(self, chat_id):
+        response = mock.Mock(status_code=200)
+        with mock.patch.object(telegram_notifier._SESSION, "post", return_value=response) as post, \
+                mock.patch.object(telegram_notifier._limiter, "acquire"):
+            notifier = telegram_notifier.Notifier()
+            sent = notifier._send_telegram_message(chat_id, "<b>hi</b>")
+        return sent, json.loads(post.call_args.kwargs["data"])
+
+    def test_int_chat_id(self):
+        sent, payload = self._send(12345)
+        self.assertTrue(sent)
+        self.assertEqual(payload, {"chat_id": 12345, "text": "<b>hi</b>", "parse_mode": "HTML", "disable_web_page_preview": True})
+
+    def test_str_chat_id(self):
+        sent, payload = self._send("12345")
+        self.assertTrue(sent)
+        self.assertEqual(payload["chat_id"], "12345")
+        self.assertEqual(payload["text"], "<b>hi</b>")
+
+
+class FlushSubscribersTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.subscribers_file = Path(tmp.name) / "telegram_subscribers.json"
+        for name, value in (
+            ("SUBSCRIBERS_FILE", self.subscribers_file),
+            ("_subscriber_data", None),
+            ("_subscribers_dirty", False),
+            ("_flush_timer", None),
+        ):
+            patcher = mock.patch.object(telegram_notifier, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_flush_writes_pending_changes_immediately(self):
+        notifier = telegram_notifier.Notifier()
+        notifier.add_subscriber(42)
+        self.assertFalse(self.subscribers_file.exists())
+
+        self.assertTrue(telegram_notifier.flush_subscribers())
+        self.assertEqual(json.loads(self.subscribers_file.read_text())["chat_ids"], [42])
+        self.assertIsNone(telegram_notifier._flush_timer)
+
+    def test_failed_write_stays_pending(self):
+        notifier = telegram_notifier.Notifier()
+        notifier.add_subscriber(42)
+        with mock.patch.object(telegram_notifier.os, "replace", side_effect=OSError("disk full")):
+            self.assertFalse(telegram_notifier.flush_subscribers())
+        self.assertTrue(telegram_notifier.flush_subscribers())
+        self.assertEqual(json.loads(self.subscribers_file.read_text())["chat_ids"], [42])
+
+
+# Runs the bot for one /start update and kills the process (no atexit, no timers) right before the
+# getUpdates offset would be saved
+KILLED_BOT_SCRIPT = """
+import os, sys
+from pathlib import Path
+from unittest import mock
+import orjson
+import telegram_notifier
+
+tmp = Path(sys.argv[1])
+telegram_notifier.SUBSCRIBERS_FILE = tmp / "telegram_subscribers.json"
+telegram_notifier.OFFSET_FILE = tmp / "telegram_offset.json"
+update = {"update_id": 7, "message": {"chat": {"id": 777}, "text": "/start"}}
+response = mock.Mock(status_code=200, content=orjson.dumps({"ok": True, "result": [update]}))
+with mock.patch.object(telegram_notifier._SESSION, "get", return_value=response), \\
+        mock.patch.object(telegram_notifier._SESSION, "post"), \\
+        mock.patch.object(telegram_notifier, "_save_last_update_id", side_effect=lambda _: os._exit(0)):
+    telegram_notifier.start_telegram_bot()
+"""
+
+
+class BotOffsetTest(unittest.TestCase):
+    def test_subscription_survives_kill_before_offset_is_saved(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            subprocess.run(
+                [sys.executable, "-c", KILLED_BOT_SCRIPT, tmp],
+                cwd=Path(telegram_notifier.__file__).parent, check=True, timeout=30,
+            )
+            subscribers = json.loads((Path(tmp) / "telegram_subscribers.json").read_text())
+            self.assertEqual(subscribers["chat_ids"], [777])
+            self.assertFalse((Path(tmp) / "telegram_offset.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
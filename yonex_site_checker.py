@@ -1,18 +1,33 @@
 #gabrielserver
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 import re
+import signal
+import hashlib
+import heapq
+import io
 import json
+import orjson
 import argparse
+import atexit
+import queue
+import threading
 from pathlib import Path
-from bs4 import BeautifulSoup
+from lxml import etree
 from products_into_db import Product_into_db
 from datetime import datetime
-from talk_to_ai import analyze_sizes, set_ai_provider, get_current_config
+from talk_to_ai import analyze_sizes_batch, set_ai_provider, get_current_config
 import os
 from telegram_notifier import Notifier
-import sqlite3
+from queued_logging import get_queued_logger
+
+# Progress output goes through the shared logging queue, like the Telegram notifier's.
+# YONEX_LOG_LEVEL=DEBUG brings back the per-page detail lines; YONEX_LOG_FILE adds a rotating log file.
+logger = get_queued_logger("yonex_site_checker", "YONEX_LOG_LEVEL")
 
 # Define sites to monitor
 SITES = [
@@ -27,9 +42,78 @@ SITES = [
 HISTORY_DIR = Path(__file__).parent / 'yonex_data' / 'history'
 DB_DIR = Path(__file__).parent / 'yonex_data' / 'databases'
 
+# Separator lines (heavy, section, product) of the change report in Telegram and in the log file
+NOTIFICATION_RULES = ('=' * 50, '-' * 40, '-' * 30)
+LOG_RULES = ('=' * 80, '-' * 60, '-' * 40)
+LOG_WRITE_BUFFER = 1 << 20
+# Characters fed to the HTML parser at a time while looking for the content area
+PARSE_CHUNK_SIZE = 64 * 1024
+# Stored sizes of a new product without a description (serialized once, shared by history and database)
+EMPTY_SIZES_JSON = json.dumps({"available": [], "sold_out": []})
+
+# Seconds between checks of a site; doubled after every unchanged check up to the maximum
+CHECK_INTERVAL = 20
+MAX_CHECK_INTERVAL = 300
+
+# One pooled session for all site fetches (TCP/TLS connections are reused between checks).
+# Connection errors are retried with backoff; requests already advertises br next to gzip when brotli is installed.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8,
+                                       max_retries=Retry(total=3, backoff_factor=0.3)))
+
 # Initialize notifier
 notifier = Notifier()
 
+# Last saved product state per site (same content as its history file)
+_last_snapshots = {}
+
+# Set by SIGTERM / SIGINT: the monitor loop wakes up at once, but a check in progress
+# (history file and database writes included) always runs to the end first
+_shutdown = threading.Event()
+
+# Telegram sends run on a background thread so a slow API never holds up the next site;
+# the bounded queue blocks the checker if the API is down for long
+NOTIFICATION_QUEUE_SIZE = 256
+# Longest time the process waits at exit for queued notifications (sends may be retrying or rate-limited)
+NOTIFICATION_DRAIN_TIMEOUT = 30
+_notification_queue = queue.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+
+def _notification_worker():
+    """Send queued notifications one after another, in the order they were queued.
+    A None item (queued at exit) stops the worker once everything before it was sent."""
+    while True:
+        item = _notification_queue.get()
+        if item is None:
+            _notification_queue.task_done()
+            return
+        send, args = item
+        try:
+            send(*args)
+        except Exception as e:
+            logger.error("❌ Error sending notification: %s", e)
+        finally:
+            _notification_queue.task_done()
+
+def queue_notification(send, *args):
+    """Hand a notification call to the background sender."""
+    _notification_queue.put((send, args))
+
+_notification_thread = threading.Thread(target=_notification_worker, name="notifications", daemon=True)
+_notification_thread.start()
+
+@atexit.register
+def _drain_notifications():
+    """Deliver whatever is still queued before the process exits, but wait at most NOTIFICATION_DRAIN_TIMEOUT."""
+    deadline = time.monotonic() + NOTIFICATION_DRAIN_TIMEOUT
+    try:
+        _notification_queue.put(None, timeout=NOTIFICATION_DRAIN_TIMEOUT)
+    except queue.Full:
+        logger.warning("⚠️ Notification queue still full at exit - dropping %d notifications", _notification_queue.qsize())
+        return
+    _notification_thread.join(max(0.0, deadline - time.monotonic()))
+    if _notification_thread.is_alive():
+        logger.warning("⚠️ Gave up waiting for queued notifications after %ds", NOTIFICATION_DRAIN_TIMEOUT)
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Yonex Product Monitoring with AI Size Analysis")
@@ -68,24 +152,25 @@ def setup_ai_provider(args):
 
 def redo_database():
     """Delete all databases and history files to start fresh."""
-    print("\n🔄 REDO MODE: Rebuilding entire database from scratch...")
-    print("=" * 60)
+    logger.info("🔄 REDO MODE: Rebuilding entire database from scratch...")
+    logger.info("=" * 60)
     
     # Delete database files
     if DB_DIR.exists():
         for db_file in DB_DIR.glob("*.db"):
-            print(f"🗑️  Deleting database: {db_file.name}")
+            logger.info("🗑️  Deleting database: %s", db_file.name)
             db_file.unlink()
     
     # Delete history JSON files
     if HISTORY_DIR.exists():
         for json_file in HISTORY_DIR.glob("*.json"):
-            print(f"🗑️  Deleting history: {json_file.name}")
+            logger.info("🗑️  Deleting history: %s", json_file.name)
             json_file.unlink()
+    _last_snapshots.clear()
     
-    print("✅ All databases and history files deleted")
-    print("📦 Will rebuild on next check...")
-    print("=" * 60 + "\n")
+    logger.info("✅ All databases and history files deleted")
+    logger.info("📦 Will rebuild on next check...")
+    logger.info("=" * 60)
 
 def add_sizes_column_to_database(db_path: Path):
     """Add sizes column to existing database if it doesn't exist."""
@@ -93,23 +178,23 @@ def add_sizes_column_to_database(db_path: Path):
         return
     
     try:
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Check if sizes column exists
-            cursor.execute("PRAGMA table_info(products)")
-            columns = [row[1] for row in cursor.fetchall()]
-            
-            if 'sizes' not in columns:
-                print(f"📊 Adding 'sizes' column to {db_path}")
-                cursor.execute("ALTER TABLE products ADD COLUMN sizes TEXT")
+        conn = Product_into_db.get_connection(db_path)
+        
+        # Check if sizes column exists
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(products)")]
+        
+        if 'sizes' not in columns:
+            logger.info("📊 Adding 'sizes' column to %s", db_path)
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("ALTER TABLE products ADD COLUMN sizes TEXT")
                 conn.commit()
-                print(f"✅ Added 'sizes' column to database")
-            else:
-                print(f"✅ 'sizes' column already exists in {db_path}")
+            logger.info("✅ Added 'sizes' column to database")
+        else:
+            logger.info("✅ 'sizes' column already exists in %s", db_path)
                 
     except Exception as e:
-        print(f"❌ Error adding sizes column: {e}")
+        logger.error("❌ Error adding sizes column: %s", e)
 
 def update_sizes_for_existing_products(db_path: Path, category_name: str):
     """Update sizes column for existing products by analyzing their descriptions."""
@@ -117,48 +202,68 @@ def update_sizes_for_existing_products(db_path: Path, category_name: str):
         return
     
     try:
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Get products without size analysis
-            cursor.execute("""
-                SELECT id, name, description 
-                FROM products 
-                WHERE type = ? AND (sizes IS NULL OR sizes = '')
-            """, (category_name,))
-            
-            products_to_update = cursor.fetchall()
-            
-            if not products_to_update:
-                print(f"✅ All products in {category_name} already have size analysis")
-                return
-            
-            print(f"🧠 Analyzing sizes for {len(products_to_update)} existing products...")
-            
-            for product_id, name, description in products_to_update:
-                if description:
-                    print(f"   Analyzing: {name[:50]}...")
-                    size_analysis = analyze_sizes(description)
-                    sizes_json = json.dumps(size_analysis)
-                    
-                    cursor.execute("""
-                        UPDATE products 
-                        SET sizes = ? 
-                        WHERE id = ?
-                    """, (sizes_json, product_id))
-            
+        # Shared WAL connection from Product_into_db (autocommit; writes use an explicit transaction)
+        conn = Product_into_db.get_connection(db_path)
+        
+        # Get products without size analysis
+        products_to_update = conn.execute("""
+            SELECT id, name, description 
+            FROM products 
+            WHERE type = ? AND (sizes IS NULL OR sizes = '')
+        """, (category_name,)).fetchall()
+        
+        if not products_to_update:
+            logger.info("✅ All products in %s already have size analysis", category_name)
+            return
+        
+        logger.info("🧠 Analyzing sizes for %s existing products...", len(products_to_update))
+        
+        # Analyze all descriptions in batches, then write every result back in one transaction
+        to_analyze = [(product_id, description) for product_id, _, description in products_to_update if description]
+        size_results = analyze_sizes_batch([description for _, description in to_analyze])
+        params = [
+            (json.dumps(size_analysis), product_id)
+            for (product_id, _), size_analysis in zip(to_analyze, size_results)
+        ]
+        
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("UPDATE products SET sizes = ? WHERE id = ?", params)
             conn.commit()
-            print(f"✅ Updated size analysis for {len(products_to_update)} products")
+        logger.info("✅ Updated size analysis for %s products", len(products_to_update))
             
     except Exception as e:
-        print(f"❌ Error updating sizes: {e}")
+        logger.error("❌ Error updating sizes: %s", e)
 
-def analyze_size_changes(old_description: str, new_description: str) -> dict:
-    """Analyze size changes between old and new product descriptions."""
-    print("🔍 Analyzing size changes with AI...")
-    
-    old_sizes = analyze_sizes(old_description)
-    new_sizes = analyze_sizes(new_description)
+def migrate_site_database(site: dict):
+    """Bring an existing site database up to date: add the sizes column and analyze missing sizes."""
+    db_path = DB_DIR / f"{site['name']}_products.db"
+    add_sizes_column_to_database(db_path)
+    update_sizes_for_existing_products(db_path, site['name'])
+
+def _stored_sizes(product: dict) -> dict | None:
+    """Sizes saved with a product in the history file, or None if missing or the analysis had failed."""
+    try:
+        sizes = json.loads(product.get('sizes') or 'null')
+    except ValueError:
+        return None
+    if not isinstance(sizes, dict) or 'error' in sizes:
+        return None
+    return sizes
+
+def compare_sizes(old_sizes: dict, new_sizes: dict) -> dict:
+    """Compare two size analyses and list what became available or sold out."""
+    # Identical analyses (the usual case when only the wording changed) need no set arithmetic
+    if old_sizes == new_sizes:
+        return {
+            "old_sizes": old_sizes,
+            "new_sizes": new_sizes,
+            "newly_available": [],
+            "newly_sold_out": [],
+            "no_longer_available": [],
+            "no_longer_sold_out": [],
+            "has_size_changes": False
+        }
     
     # Compare available sizes
     old_available = set(old_sizes.get("available", []))
@@ -184,6 +289,15 @@ def analyze_size_changes(old_description: str, new_description: str) -> dict:
         "has_size_changes": bool(newly_available or newly_sold_out or no_longer_available or no_longer_sold_out)
     }
 
+# Patterns used by normalize_text, which runs for every field of every product
+_WHITESPACE_RE = re.compile(r'\s+')
+# Applied one after another: a single alternation would treat overlapping matches differently
+# Each pattern is paired with its literal keyword, so it only runs when the keyword is present
+_DYNAMIC_ELEMENT_RES = tuple(
+    (prefix, re.compile(prefix + r'[^"]*"[^"]*"')) for prefix in ('timestamp', 'session', 'csrf', 'nonce', '_token')
+)
+_QUOTE_RE = re.compile(r'["\']')
+
 def normalize_text(text: str) -> str:
     """Normalize text to remove inconsistencies that don't affect content."""
     if not text:
@@ -192,21 +306,17 @@ def normalize_text(text: str) -> str:
     # Convert to lowercase for consistent comparison
     text = text.lower()
     
-    # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text)
+    # Normalize whitespace and remove trailing/leading whitespace
+    text = _WHITESPACE_RE.sub(' ', text).strip()
     
-    # Remove trailing/leading whitespace
-    text = text.strip()
-    
-    # Remove common dynamic elements
-    text = re.sub(r'timestamp[^"]*"[^"]*"', '', text)
-    text = re.sub(r'session[^"]*"[^"]*"', '', text)
-    text = re.sub(r'csrf[^"]*"[^"]*"', '', text)
-    text = re.sub(r'nonce[^"]*"[^"]*"', '', text)
-    text = re.sub(r'_token[^"]*"[^"]*"', '', text)
+    # Remove common dynamic elements (all of them end in a quoted value, so most texts skip this)
+    if '"' in text:
+        for prefix, pattern in _DYNAMIC_ELEMENT_RES:
+            if prefix in text:
+                text = pattern.sub('', text)
     
     # Remove any remaining quotes and normalize
-    text = re.sub(r'["\']', '', text)
+    text = _QUOTE_RE.sub('', text)
     
     return text
 
@@ -229,69 +339,195 @@ def normalize_image_url(url: str) -> str:
     
     return url.lower().strip()
 
+# Product page structure: the product headers inside the content area (div#content3)
+_PRODUCT_HEADERS_XPATH = etree.XPath(".//h2[contains(concat(' ', normalize-space(@class), ' '), ' underline ')]")
+# Elements whose text is not page text (BeautifulSoup's get_text skips them too)
+_NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+def _text_parts(element, skip=None) -> list:
+    """Text nodes under element in document order, like BeautifulSoup's .strings
+    (comments, scripts and styles left out). The skip subtree only contributes its tail text."""
+    parts = []
+    
+    def walk(node):
+        if node.text and node.tag not in _NON_TEXT_TAGS:
+            parts.append(node.text)
+        for child in node:
+            if child is not skip and isinstance(child.tag, str):
+                walk(child)
+            if child.tail:
+                parts.append(child.tail)
+    
+    walk(element)
+    return parts
+
+def _joined_text(element, separator: str = '', skip=None) -> str:
+    """Equivalent of BeautifulSoup's get_text(separator, strip=True)."""
+    return separator.join(part for part in (text.strip() for text in _text_parts(element, skip)) if part)
+
+def _single_string(element):
+    """Equivalent of BeautifulSoup's Tag.string: the text if the tag holds exactly one string."""
+    if len(element) == 0:
+        return element.text
+    if len(element) == 1 and not element.text and not element[0].tail:
+        child = element[0]
+        return _single_string(child) if isinstance(child.tag, str) else child.text
+    return None
+
+def _has_class(element, class_name: str) -> bool:
+    return class_name in (element.get('class') or '').split()
+
+def _next_sibling(element, tag: str, class_name: str):
+    """First following sibling with the given tag and class (find_next_sibling)."""
+    for sibling in element.itersiblings(tag):
+        if _has_class(sibling, class_name):
+            return sibling
+    return None
+
+def _page_meta_file(site_name: str) -> Path:
+    return HISTORY_DIR / f"{site_name}_meta.json"
+
+def _conditional_headers(site_name: str) -> dict:
+    """If-None-Match / If-Modified-Since from the last fully processed fetch of this site."""
+    meta_file = _page_meta_file(site_name)
+    # Without the history there is nothing to compare against, so the page must be fetched in full
+    if not meta_file.exists() or not (HISTORY_DIR / f"{site_name}_products.json").exists():
+        return {}
+    try:
+        meta = orjson.loads(meta_file.read_bytes())
+    except (OSError, ValueError) as e:
+        logger.warning("⚠️ Could not read page metadata for %s: %s", site_name, e)
+        return {}
+    
+    headers = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    return headers
+
+def _save_page_validators(site_name: str, validators: dict):
+    """Remember the page's ETag / Last-Modified; only called once the matching history is written."""
+    try:
+        if not any(validators.values()):
+            # Server stopped sending validators; don't keep sending stale ones
+            _page_meta_file(site_name).unlink(missing_ok=True)
+            return
+        _page_meta_file(site_name).write_bytes(orjson.dumps(validators, option=orjson.OPT_INDENT_2))
+    except OSError as e:
+        logger.warning("⚠️ Could not save page metadata for %s: %s", site_name, e)
+
+def fetch_site_products(url: str, site_name: str) -> tuple:
+    """Fetch a site with a conditional GET.
+    Returns (products, validators); products is None when the server answered 304 Not Modified."""
+    response = _SESSION.get(url, headers=_conditional_headers(site_name), timeout=10)
+    if response.status_code == 304:
+        return None, {}
+    response.raise_for_status()
+    
+    validators = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+    return parse_products_page(response), validators
+
 def get_products_with_image_ids(url: str) -> dict:
     """Extract products using image URL as unique identifier."""
-    response = requests.get(url, timeout=10)
+    response = _SESSION.get(url, timeout=10)
     response.raise_for_status()
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    return parse_products_page(response)
+
+def _text_chunks(response):
+    """The response body as text chunks, decoded exactly like response.text."""
+    if response.encoding is None:
+        # response.text would guess the charset from the whole body
+        yield response.text
+        return
+    yield from response.iter_content(PARSE_CHUNK_SIZE, decode_unicode=True)
+
+def _is_content_area(element) -> bool:
+    # The first div#content3 in document order is the outermost one if they are nested
+    return element.get('id') == 'content3' and not any(
+        ancestor.get('id') == 'content3' for ancestor in element.iterancestors('div'))
+
+def _find_content_area(response):
+    """Feed the page to lxml until the content area has been closed and return it (None if missing).
+    Markup after it is never parsed, so no tree is built for the rest of the page."""
+    parser = etree.HTMLPullParser(events=('end',), tag='div')
+    for chunk in _text_chunks(response):
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if _is_content_area(element):
+                return element
     
+    # Elements still open at the end of the page are only closed by close()
+    parser.close()
+    return next((element for _, element in parser.read_events() if _is_content_area(element)), None)
+
+def parse_products_page(response) -> dict:
+    """Extract products from a category page response, keyed by normalized image URL."""
     # Extract only the product content area
-    main_content = soup.find('div', id='content3')
-    if not main_content:
-        print("⚠️ Could not find main content area")
+    main_content = _find_content_area(response)
+    if main_content is None:
+        logger.warning("⚠️ Could not find main content area")
         return {}
     
     # Extract products with image URL as key
     products_by_image = {}
     
-    headers = main_content.find_all('h2', class_='underline')
-    print(f"🔍 Found {len(headers)} products on the page")
+    headers = _PRODUCT_HEADERS_XPATH(main_content)
+    logger.debug("🔍 Found %s products on the page", len(headers))
     
     for header in headers:
         try:
-            # Get product name
-            header_copy = header.__copy__()
-            name_element = header_copy.find('a')
-            if name_element:
-                name_element.extract()
-            name = normalize_text(header_copy.get_text(strip=True))
+            # Get product name (header text without its link)
+            name_element = next(header.iter('a'), None)
+            name = normalize_text(_joined_text(header, skip=name_element))
             
             if not name:
                 continue
             
             # Get image URL as unique identifier
-            image_div = header.find_next_sibling('div', class_='image')
+            image_div = _next_sibling(header, 'div', 'image')
             pic_url = ''
-            if image_div:
-                link = image_div.find('a')
-                if link and link.has_attr('href'):
-                    pic_url = normalize_image_url(link['href'])
+            if image_div is not None:
+                link = next(image_div.iter('a'), None)
+                if link is not None and link.get('href') is not None:
+                    pic_url = normalize_image_url(link.get('href'))
             
             if not pic_url:
-                print(f"⚠️ No image URL found for product: {name}")
+                logger.warning("⚠️ No image URL found for product: %s", name)
                 continue
             
             # Get description (keep original for Gemini analysis)
-            description_div = header.find_next_sibling('div', class_='description')
+            description_div = _next_sibling(header, 'div', 'description')
             original_description = ''
-            if description_div:
-                original_description = description_div.get_text(separator=' ', strip=True)
+            if description_div is not None:
+                original_description = _joined_text(description_div, separator=' ')
             
             # Normalize description for comparison
             normalized_description = normalize_text(original_description)
             
             # Get price
-            attributes_dl = header.find_next_sibling('dl', class_='attributes')
+            attributes_dl = _next_sibling(header, 'dl', 'attributes')
             price = ''
-            if attributes_dl:
-                price_dt = attributes_dl.find('dt', string=lambda text: text and 'Preis' in text)
-                if price_dt:
-                    price_dd = price_dt.find_next_sibling('dd')
-                    if price_dd:
-                        price = price_dd.get_text(strip=True)
+            if attributes_dl is not None:
+                for price_dt in attributes_dl.iterdescendants('dt'):
+                    dt_text = _single_string(price_dt)
+                    if dt_text and 'Preis' in dt_text:
+                        price_dd = next(price_dt.itersiblings('dd'), None)
+                        if price_dd is not None:
+                            price = _joined_text(price_dd)
+                        break
             price = normalize_text(price)
             
+            # Hash of the raw markup every compared field comes from; equal hash => equal fields
+            block_hash = hashlib.blake2b(digest_size=8)
+            for element in (header, description_div, attributes_dl):
+                block_hash.update(etree.tostring(element, with_tail=False) if element is not None else b'-')
+                block_hash.update(b'\0')
+            
             # Store product with image URL as key
             products_by_image[pic_url] = {
                 'name': name,
@@ -299,44 +535,66 @@ def get_products_with_image_ids(url: str) -> dict:
                 'description': normalized_description,
                 'original_description': original_description,  # Keep original for Gemini
                 'price': price,
-                'sizes': None  # Will be analyzed only if needed (on changes)
+                'sizes': None,  # Will be analyzed only if needed (on changes)
+                'block_hash': block_hash.hexdigest()
             }
             
         except Exception as e:
-            print(f"⚠️ Error processing product: {e}")
+            logger.warning("⚠️ Error processing product: %s", e)
             continue
     
-    print(f"📝 Processed {len(products_by_image)} products with unique image URLs")
+    logger.debug("📝 Processed %s products with unique image URLs", len(products_by_image))
     return products_by_image
 
-def analyze_product_changes(url: str, site_name: str) -> dict:
-    """Analyze product changes using image URLs as unique identifiers."""
+def analyze_product_changes(url: str, site_name: str, current_products: dict | None = None,
+                            validators: dict | None = None) -> dict:
+    """Analyze product changes using image URLs as unique identifiers.
+    current_products can be passed in when the page was already fetched; validators
+    (ETag / Last-Modified of that fetch) are stored once the new history is written."""
     try:
         # Get current products
-        current_products = get_products_with_image_ids(url)
+        if current_products is None:
+            current_products = get_products_with_image_ids(url)
         
         # Load previous products
         history_file = HISTORY_DIR / f"{site_name}_products.json"
-        previous_products = {}
         
-        if history_file.exists():
-            with open(history_file, 'r', encoding='utf-8') as f:
-                previous_products = json.load(f)
+        # The history file is only read once per process; afterwards the last saved state is kept in memory
+        previous_products = _last_snapshots.get(site_name)
+        if previous_products is None:
+            previous_products = orjson.loads(history_file.read_bytes()) if history_file.exists() else {}
         
         # Analyze changes using image URLs as identifiers
-        current_images = set(current_products.keys())
-        previous_images = set(previous_products.keys())
+        # Key views support set operations directly, no intermediate sets are built
+        current_images = current_products.keys()
+        previous_images = previous_products.keys()
         
         removed_images = previous_images - current_images
         added_images = current_images - previous_images
         common_images = current_images & previous_images
         
         # Check for content changes in existing products
+        # (size analysis for changed descriptions is collected and done in one batch below)
         modified_products = []
-        for image_url in common_images:
+        size_checks = []  # (modification, stored old sizes or None, old description, new description)
+        
+        # Only products whose source markup changed since the last run can be modified; the set
+        # difference finds them in one pass (older history has no hash, so all of those are checked)
+        current_signatures = {(image_url, product.get('block_hash')) for image_url, product in current_products.items()}
+        previous_signatures = {(image_url, product.get('block_hash')) for image_url, product in previous_products.items()}
+        changed_images = {image_url for image_url, _ in current_signatures - previous_signatures} & common_images
+        
+        # The history file doubles as the size cache: unchanged products keep their analyzed sizes
+        for image_url in common_images - changed_images:
+            current_products[image_url]['sizes'] = previous_products[image_url].get('sizes')
+        
+        for image_url in changed_images:
             current = current_products[image_url]
             previous = previous_products[image_url]
             
+            if current['description'] == previous['description']:
+                current['sizes'] = previous.get('sizes')
+            
             # Compare all fields except image_url
             if (current['name'] != previous['name'] or 
                 current['description'] != previous['description'] or 
@@ -347,32 +605,49 @@ def analyze_product_changes(url: str, site_name: str) -> dict:
                     'old': previous,
                     'new': current
                 }
-                  # If description changed, analyze size changes with Gemini
+                # If description changed, the sizes have to be re-analyzed
                 if current['description'] != previous['description']:
-                    print(f"🧠 Description changed for {current['name']}, analyzing sizes...")
+                    logger.info("🧠 Description changed for %s, analyzing sizes...", current['name'])
                     
                     old_desc = previous.get('original_description', previous['description'])
                     new_desc = current.get('original_description', current['description'])
-                    
-                    size_analysis = analyze_size_changes(old_desc, new_desc)
-                    modification['size_analysis'] = size_analysis
-                    
-                    # Store the new sizes in current_products for database
-                    current_products[image_url]['sizes'] = json.dumps(size_analysis.get('new_sizes', {}))
+                    size_checks.append((modification, _stored_sizes(previous), old_desc, new_desc))
                 
                 modified_products.append(modification)
         
-        # Analyze sizes for ADDED products only (they need initial size analysis)
+        # ADDED products need an initial size analysis (only those with a description)
+        to_analyze = [img for img in added_images if current_products[img].get('original_description')]
+        if to_analyze:
+            logger.info("🧠 Analyzing sizes for %s new products...", len(to_analyze))
+        
+        # One batch for every description of this run: old side of modified products (unless the
+        # history already has its sizes) and new side, then added ones
+        batch = []
+        for _, old_sizes, old_desc, new_desc in size_checks:
+            if old_sizes is None:
+                batch.append(old_desc)
+            batch.append(new_desc)
+        batch.extend(current_products[img]['original_description'] for img in to_analyze)
+        batch_results = iter(analyze_sizes_batch(batch))
+        
+        for modification, old_sizes, _, _ in size_checks:
+            if old_sizes is None:
+                old_sizes = next(batch_results)
+            size_analysis = compare_sizes(old_sizes, next(batch_results))
+            modification['size_analysis'] = size_analysis
+            
+            # Store the new sizes in current_products for database
+            current_products[modification['image_url']]['sizes'] = json.dumps(size_analysis.get('new_sizes', {}))
+        
+        added_sizes = dict(zip(to_analyze, batch_results))
+        
         added_products_list = []
         for img in added_images:
             product = current_products[img].copy()
-            # Only analyze if we have a description
-            if product.get('original_description'):
-                print(f"🧠 Analyzing sizes for new product: {product['name'][:40]}...")
-                size_analysis = analyze_sizes(product.get('original_description', ''))
-                product['sizes'] = json.dumps(size_analysis)
+            if img in added_sizes:
+                product['sizes'] = json.dumps(added_sizes[img])
             else:
-                product['sizes'] = json.dumps({"available": [], "sold_out": []})
+                product['sizes'] = EMPTY_SIZES_JSON
             added_products_list.append(product)
             # Also update in current_products for database storage
             current_products[img]['sizes'] = product['sizes']
@@ -386,126 +661,135 @@ def analyze_product_changes(url: str, site_name: str) -> dict:
             'current_products': current_products  # Include for database update
         }
         
-        # Save current state for next comparison
-        history_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(history_file, 'w', encoding='utf-8') as f:
-            json.dump(current_products, f, indent=2, ensure_ascii=False)
+        # Save current state for next comparison (unchanged markup everywhere means the stored state is current)
+        if removed_images or added_images or changed_images or not history_file.exists():
+            history_file.parent.mkdir(parents=True, exist_ok=True)
+            history_file.write_bytes(orjson.dumps(current_products, option=orjson.OPT_INDENT_2))
+        _last_snapshots[site_name] = current_products
+        if validators:
+            _save_page_validators(site_name, validators)
         
         return changes
         
     except Exception as e:
         error_msg = f"Error analyzing changes for {site_name}: {e}"
-        print(f"❌ {error_msg}")
-        notifier.send_error_to_owner(error_msg)
+        logger.error("❌ %s", error_msg)
+        queue_notification(notifier.send_error_to_owner, error_msg)
         return {'removed': [], 'added': [], 'modified': [], 'total_current': 0, 'total_previous': 0, 'current_products': {}}
 
-def send_notifications_for_changes(changes: dict, site_name: str):
-    """Send notifications for all detected changes with full detailed text (same as log file)."""
-    
-    if not any([changes['removed'], changes['added'], changes['modified']]):
-        return
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def _write_change_report(w, changes: dict, site_name: str, timestamp: str, rules: tuple):
+    """Write the detailed change report (shared by the Telegram message and the log file) through w.
+    rules holds the (heavy, section, product) separator lines; the report ends without a newline."""
+    heavy_rule, section_rule, product_rule = rules
     
-    # Build the full message exactly like the log file format
-    lines = []
-    lines.append(f"{'='*50}")
-    lines.append(f"PRODUCT CHANGES DETECTED - {site_name.upper()}")
-    lines.append(f"Timestamp: {timestamp}")
-    lines.append(f"Total Products: {changes['total_previous']} → {changes['total_current']}")
-    lines.append(f"{'='*50}")
+    w(f"{heavy_rule}\n")
+    w(f"PRODUCT CHANGES DETECTED - {site_name.upper()}\n")
+    w(f"Timestamp: {timestamp}\n")
+    w(f"Total Products: {changes['total_previous']} → {changes['total_current']}\n")
+    w(f"{heavy_rule}\n")
     
     # Removed products
     if changes['removed']:
-        lines.append(f"\n🗑️  REMOVED PRODUCTS ({len(changes['removed'])}):")
-        lines.append("-" * 40)
+        w(f"\n🗑️  REMOVED PRODUCTS ({len(changes['removed'])}):\n")
+        w(f"{section_rule}\n")
         for i, product in enumerate(changes['removed'], 1):
-            lines.append(f"REMOVED #{i}:")
-            lines.append(f"  Name: {product['name']}")
-            lines.append(f"  Price: {product['price']}")
-            lines.append(f"  Image URL: {product['image_url']}")
-            lines.append(f"  Description: {product['description']}")
-            lines.append("-" * 30)
+            w(f"REMOVED #{i}:\n")
+            w(f"  Name: {product['name']}\n")
+            w(f"  Price: {product['price']}\n")
+            w(f"  Image URL: {product['image_url']}\n")
+            w(f"  Description: {product['description']}\n")
+            w(f"{product_rule}\n")
     
     # Added products
     if changes['added']:
-        lines.append(f"\n🆕 NEW PRODUCTS ({len(changes['added'])}):")
-        lines.append("-" * 40)
+        w(f"\n🆕 NEW PRODUCTS ({len(changes['added'])}):\n")
+        w(f"{section_rule}\n")
         for i, product in enumerate(changes['added'], 1):
-            lines.append(f"NEW #{i}:")
-            lines.append(f"  Name: {product['name']}")
-            lines.append(f"  Price: {product['price']}")
-            lines.append(f"  Image URL: {product['image_url']}")
-            lines.append(f"  Description: {product['description']}")
-            lines.append("-" * 30)
-    
-    # Modified products with detailed comparison
+            w(f"NEW #{i}:\n")
+            w(f"  Name: {product['name']}\n")
+            w(f"  Price: {product['price']}\n")
+            w(f"  Image URL: {product['image_url']}\n")
+            w(f"  Description: {product['description']}\n")
+            w(f"{product_rule}\n")
+    
+    # Modified products with detailed old vs new comparison
     if changes['modified']:
-        lines.append(f"\n🔄 MODIFIED PRODUCTS ({len(changes['modified'])}):")
-        lines.append("-" * 40)
+        w(f"\n🔄 MODIFIED PRODUCTS ({len(changes['modified'])}):\n")
+        w(f"{section_rule}\n")
         for i, mod in enumerate(changes['modified'], 1):
-            lines.append(f"MODIFIED #{i} - Image: {mod['image_url']}")
+            w(f"MODIFIED #{i} - Image: {mod['image_url']}\n")
             
             old = mod['old']
             new = mod['new']
             
             # Name comparison
             if old['name'] != new['name']:
-                lines.append(f"  ❌ NAME CHANGED:")
-                lines.append(f"     OLD: {old['name']}")
-                lines.append(f"     NEW: {new['name']}")
+                w(f"  ❌ NAME CHANGED:\n")
+                w(f"     OLD: {old['name']}\n")
+                w(f"     NEW: {new['name']}\n")
             else:
-                lines.append(f"  ✅ Name (unchanged): {new['name']}")
+                w(f"  ✅ Name (unchanged): {new['name']}\n")
             
             # Price comparison
             if old['price'] != new['price']:
-                lines.append(f"  ❌ PRICE CHANGED:")
-                lines.append(f"     OLD: {old['price']}")
-                lines.append(f"     NEW: {new['price']}")
+                w(f"  ❌ PRICE CHANGED:\n")
+                w(f"     OLD: {old['price']}\n")
+                w(f"     NEW: {new['price']}\n")
             else:
-                lines.append(f"  ✅ Price (unchanged): {new['price']}")
+                w(f"  ✅ Price (unchanged): {new['price']}\n")
             
             # Description comparison
             if old['description'] != new['description']:
-                lines.append(f"  ❌ DESCRIPTION CHANGED:")
-                lines.append(f"     OLD: {old['description']}")
-                lines.append(f"     NEW: {new['description']}")
+                w(f"  ❌ DESCRIPTION CHANGED:\n")
+                w(f"     OLD: {old['description']}\n")
+                w(f"     NEW: {new['description']}\n")
             else:
-                lines.append(f"  ✅ Description (unchanged): {new['description'][:100]}...")
+                w(f"  ✅ Description (unchanged): {new['description'][:100]}...\n")
             
             # Size analysis if available
             if 'size_analysis' in mod:
                 size_analysis = mod['size_analysis']
                 if size_analysis['has_size_changes']:
-                    lines.append(f"  🧠 SIZE CHANGES DETECTED:")
+                    w(f"  🧠 SIZE CHANGES DETECTED:\n")
                     
                     if size_analysis['newly_available']:
-                        lines.append(f"     ✅ Newly Available: {size_analysis['newly_available']}")
+                        w(f"     ✅ Newly Available: {size_analysis['newly_available']}\n")
                     
                     if size_analysis['newly_sold_out']:
-                        lines.append(f"     ❌ Newly Sold Out: {size_analysis['newly_sold_out']}")
+                        w(f"     ❌ Newly Sold Out: {size_analysis['newly_sold_out']}\n")
                     
                     if size_analysis['no_longer_available']:
-                        lines.append(f"     ⚠️ No Longer Available: {size_analysis['no_longer_available']}")
+                        w(f"     ⚠️ No Longer Available: {size_analysis['no_longer_available']}\n")
                     
                     if size_analysis['no_longer_sold_out']:
-                        lines.append(f"     🔄 No Longer Sold Out: {size_analysis['no_longer_sold_out']}")
+                        w(f"     🔄 No Longer Sold Out: {size_analysis['no_longer_sold_out']}\n")
                     
-                    lines.append(f"     OLD Sizes - Available: {size_analysis['old_sizes'].get('available', [])}")
-                    lines.append(f"     OLD Sizes - Sold Out: {size_analysis['old_sizes'].get('sold_out', [])}")
-                    lines.append(f"     NEW Sizes - Available: {size_analysis['new_sizes'].get('available', [])}")
-                    lines.append(f"     NEW Sizes - Sold Out: {size_analysis['new_sizes'].get('sold_out', [])}")
+                    w(f"     OLD Sizes - Available: {size_analysis['old_sizes'].get('available', [])}\n")
+                    w(f"     OLD Sizes - Sold Out: {size_analysis['old_sizes'].get('sold_out', [])}\n")
+                    w(f"     NEW Sizes - Available: {size_analysis['new_sizes'].get('available', [])}\n")
+                    w(f"     NEW Sizes - Sold Out: {size_analysis['new_sizes'].get('sold_out', [])}\n")
                 else:
-                    lines.append(f"  ✅ Size availability unchanged")
+                    w(f"  ✅ Size availability unchanged\n")
             
-            lines.append(f"  ✅ Image URL: {new['image_url']}")
-            lines.append("-" * 30)
+            # Image URL (should be the same since it's our key)
+            w(f"  ✅ Image URL: {new['image_url']}\n")
+            w(f"{product_rule}\n")
     
-    lines.append(f"\nEnd of changes for {site_name} at {timestamp}")
-    lines.append(f"{'='*50}")
+    w(f"\nEnd of changes for {site_name} at {timestamp}\n")
+    w(heavy_rule)
+
+def send_notifications_for_changes(changes: dict, site_name: str):
+    """Send notifications for all detected changes with full detailed text (same as log file)."""
     
-    # Join all lines and send as a single notification
-    full_message = "\n".join(lines)
+    if not any([changes['removed'], changes['added'], changes['modified']]):
+        return
+    
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    # Build the full message exactly like the log file format (narrower separators for Telegram)
+    buf = io.StringIO()
+    _write_change_report(buf.write, changes, site_name, timestamp, NOTIFICATION_RULES)
+    full_message = buf.getvalue()
     
     # Send the full detailed message to Telegram
     notifier.send_notification(
@@ -514,71 +798,71 @@ def send_notifications_for_changes(changes: dict, site_name: str):
         tag=f"changes-{site_name}"
     )
     
-    print(f"📱 Sent full detailed notification for {site_name}")
+    logger.info("📱 Sent full detailed notification for %s", site_name)
 
 def display_product_warnings(changes: dict, site_name: str):
     """Display detailed warnings for removed and added products."""
     
     # Warning for removed products
     if changes['removed']:
-        print(f"\n🚨 WARNING: {len(changes['removed'])} PRODUCT(S) REMOVED FROM {site_name.upper()}!")
-        print("=" * 60)
+        logger.info("🚨 WARNING: %s PRODUCT(S) REMOVED FROM %s!", len(changes['removed']), site_name.upper())
+        logger.info("=" * 60)
         for i, product in enumerate(changes['removed'], 1):
-            print(f"🗑️  REMOVED PRODUCT #{i}:")
-            print(f"   Name: {product['name']}")
-            print(f"   Price: {product['price']}")
-            print(f"   Image: {product['image_url']}")
-            print(f"   Description: {product['description'][:80]}...")
-            print("-" * 40)
+            logger.info("🗑️  REMOVED PRODUCT #%s:", i)
+            logger.info("   Name: %s", product['name'])
+            logger.info("   Price: %s", product['price'])
+            logger.info("   Image: %s", product['image_url'])
+            logger.info("   Description: %s...", product['description'][:80])
+            logger.info("-" * 40)
     
     # Warning for added products
     if changes['added']:
-        print(f"\n🚨 WARNING: {len(changes['added'])} NEW PRODUCT(S) ADDED TO {site_name.upper()}!")
-        print("=" * 60)
+        logger.info("🚨 WARNING: %s NEW PRODUCT(S) ADDED TO %s!", len(changes['added']), site_name.upper())
+        logger.info("=" * 60)
         for i, product in enumerate(changes['added'], 1):
-            print(f"🆕 NEW PRODUCT #{i}:")
-            print(f"   Name: {product['name']}")
-            print(f"   Price: {product['price']}")
-            print(f"   Image: {product['image_url']}")
-            print(f"   Description: {product['description'][:80]}...")
-            print("-" * 40)
+            logger.info("🆕 NEW PRODUCT #%s:", i)
+            logger.info("   Name: %s", product['name'])
+            logger.info("   Price: %s", product['price'])
+            logger.info("   Image: %s", product['image_url'])
+            logger.info("   Description: %s...", product['description'][:80])
+            logger.info("-" * 40)
     
     # Info for modified products with detailed comparison and size changes
     if changes['modified']:
-        print(f"\n📝 INFO: {len(changes['modified'])} PRODUCT(S) MODIFIED ON {site_name.upper()}:")
-        print("=" * 60)
+        logger.info("📝 INFO: %s PRODUCT(S) MODIFIED ON %s:", len(changes['modified']), site_name.upper())
+        logger.info("=" * 60)
         for i, mod in enumerate(changes['modified'], 1):
-            print(f"🔄 MODIFIED PRODUCT #{i}:")
-            print(f"   Image: {mod['image_url']}")
+            logger.info("🔄 MODIFIED PRODUCT #%s:", i)
+            logger.info("   Image: %s", mod['image_url'])
             
             # Show what changed
             old = mod['old']
             new = mod['new']
             
             if old['name'] != new['name']:
-                print(f"   ❌ NAME: {old['name']} → {new['name']}")
+                logger.info("   ❌ NAME: %s → %s", old['name'], new['name'])
             else:
-                print(f"   ✅ Name: {new['name']}")
+                logger.info("   ✅ Name: %s", new['name'])
             
             if old['price'] != new['price']:
-                print(f"   ❌ PRICE: {old['price']} → {new['price']}")
+                logger.info("   ❌ PRICE: %s → %s", old['price'], new['price'])
             else:
-                print(f"   ✅ Price: {new['price']}")
+                logger.info("   ✅ Price: %s", new['price'])
             
             if old['description'] != new['description']:
-                print(f"   ❌ DESCRIPTION CHANGED")
+                logger.info("   ❌ DESCRIPTION CHANGED")
                 # Show size changes if available
                 if 'size_analysis' in mod and mod['size_analysis']['has_size_changes']:
                     size_analysis = mod['size_analysis']
-                    print(f"   🧠 SIZE CHANGES:")
+                    logger.info("   🧠 SIZE CHANGES:")
                     if size_analysis['newly_available']:
-                        print(f"      ✅ Newly Available: {', '.join(size_analysis['newly_available'])}")
+                        logger.info("      ✅ Newly Available: %s", ', '.join(size_analysis['newly_available']))
                     if size_analysis['newly_sold_out']:
-                        print(f"      ❌ Newly Sold Out: {', '.join(size_analysis['newly_sold_out'])}")
+                        logger.info("      ❌ Newly Sold Out: %s", ', '.join(size_analysis['newly_sold_out']))
             else:
-                print(f"   ✅ Description: unchanged")
+                logger.info("   ✅ Description: unchanged")
             
-            print("-" * 40)
+            logger.info("-" * 40)
 
 def log_changes(changes: dict, site_name: str):
     """Log detailed changes to a single master file with complete old vs new info and size analysis."""
@@ -593,144 +877,151 @@ def log_changes(changes: dict, site_name: str):
     
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    # Append to master log file
-    with open(log_file, 'a', encoding='utf-8') as f:
-        f.write(f"\n{'='*80}\n")
-        f.write(f"PRODUCT CHANGES DETECTED - {site_name.upper()}\n")
-        f.write(f"Timestamp: {timestamp}\n")
-        f.write(f"Total Products: {changes['total_previous']} → {changes['total_current']}\n")
-        f.write(f"{'='*80}\n")
-        
-        # Log removed products
-        if changes['removed']:
-            f.write(f"\n🗑️  REMOVED PRODUCTS ({len(changes['removed'])}):\n")
-            f.write("-" * 60 + "\n")
-            for i, product in enumerate(changes['removed'], 1):
-                f.write(f"REMOVED #{i}:\n")
-                f.write(f"  Name: {product['name']}\n")
-                f.write(f"  Price: {product['price']}\n")
-                f.write(f"  Image URL: {product['image_url']}\n")
-                f.write(f"  Description: {product['description']}\n")
-                f.write("-" * 40 + "\n")
-        
-        # Log added products
-        if changes['added']:
-            f.write(f"\n🆕 NEW PRODUCTS ({len(changes['added'])}):\n")
-            f.write("-" * 60 + "\n")
-            for i, product in enumerate(changes['added'], 1):
-                f.write(f"NEW #{i}:\n")
-                f.write(f"  Name: {product['name']}\n")
-                f.write(f"  Price: {product['price']}\n")
-                f.write(f"  Image URL: {product['image_url']}\n")
-                f.write(f"  Description: {product['description']}\n")
-                f.write("-" * 40 + "\n")
-        
-        # Log modified products with detailed old vs new comparison
-        if changes['modified']:
-            f.write(f"\n🔄 MODIFIED PRODUCTS ({len(changes['modified'])}):\n")
-            f.write("-" * 60 + "\n")
-            for i, mod in enumerate(changes['modified'], 1):
-                f.write(f"MODIFIED #{i} - Image: {mod['image_url']}\n")
-                
-                # Compare each field
-                old = mod['old']
-                new = mod['new']
-                
-                # Name comparison
-                if old['name'] != new['name']:
-                    f.write(f"  ❌ NAME CHANGED:\n")
-                    f.write(f"     OLD: {old['name']}\n")
-                    f.write(f"     NEW: {new['name']}\n")
-                else:
-                    f.write(f"  ✅ Name (unchanged): {new['name']}\n")
-                
-                # Price comparison
-                if old['price'] != new['price']:
-                    f.write(f"  ❌ PRICE CHANGED:\n")
-                    f.write(f"     OLD: {old['price']}\n")
-                    f.write(f"     NEW: {new['price']}\n")
-                else:
-                    f.write(f"  ✅ Price (unchanged): {new['price']}\n")
-                
-                # Description comparison
-                if old['description'] != new['description']:
-                    f.write(f"  ❌ DESCRIPTION CHANGED:\n")
-                    f.write(f"     OLD: {old['description']}\n")
-                    f.write(f"     NEW: {new['description']}\n")
-                else:
-                    f.write(f"  ✅ Description (unchanged): {new['description'][:100]}...\n")
-                
-                # Size analysis if available
-                if 'size_analysis' in mod:
-                    size_analysis = mod['size_analysis']
-                    if size_analysis['has_size_changes']:
-                        f.write(f"  🧠 SIZE CHANGES DETECTED:\n")
-                        
-                        if size_analysis['newly_available']:
-                            f.write(f"     ✅ Newly Available: {size_analysis['newly_available']}\n")
-                        
-                        if size_analysis['newly_sold_out']:
-                            f.write(f"     ❌ Newly Sold Out: {size_analysis['newly_sold_out']}\n")
-                        
-                        if size_analysis['no_longer_available']:
-                            f.write(f"     ⚠️ No Longer Available: {size_analysis['no_longer_available']}\n")
-                        
-                        if size_analysis['no_longer_sold_out']:
-                            f.write(f"     🔄 No Longer Sold Out: {size_analysis['no_longer_sold_out']}\n")
-                        
-                        f.write(f"     OLD Sizes - Available: {size_analysis['old_sizes'].get('available', [])}\n")
-                        f.write(f"     OLD Sizes - Sold Out: {size_analysis['old_sizes'].get('sold_out', [])}\n")
-                        f.write(f"     NEW Sizes - Available: {size_analysis['new_sizes'].get('available', [])}\n")
-                        f.write(f"     NEW Sizes - Sold Out: {size_analysis['new_sizes'].get('sold_out', [])}\n")
-                    else:
-                        f.write(f"  ✅ Size availability unchanged\n")
-                
-                # Image URL (should be the same since it's our key)
-                f.write(f"  ✅ Image URL: {new['image_url']}\n")
-                f.write("-" * 40 + "\n")
-        
-        f.write(f"\nEnd of changes for {site_name} at {timestamp}\n")
-        f.write(f"{'='*80}\n")
+    # Build the whole entry in memory, then append it to the master log file in one write
+    buf = io.StringIO()
+    buf.write("\n")
+    _write_change_report(buf.write, changes, site_name, timestamp, LOG_RULES)
+    buf.write("\n")
+    with open(log_file, 'a', encoding='utf-8', buffering=LOG_WRITE_BUFFER) as f:
+        f.write(buf.getvalue())
     
-    print(f"📝 Changes logged to master file: {log_file}")
+    logger.info("📝 Changes logged to master file: %s", log_file)
 
-def has_site_changed(url: str, site_name: str) -> dict | None:
+def has_site_changed(url: str, site_name: str, current_products: dict | None = None,
+                     validators: dict | None = None) -> dict | None:
     """Check if site has changed and provide detailed change analysis.
     Returns the changes dict if changes detected, None otherwise."""
     try:
-        print(f"🔍 Checking for changes at {url}...")
+        logger.debug("🔍 Checking for changes at %s...", url)
         
         # Analyze changes using image URLs
-        changes = analyze_product_changes(url, site_name)
+        changes = analyze_product_changes(url, site_name, current_products, validators)
         
         has_changes = bool(changes['removed'] or changes['added'] or changes['modified'])
         
         if not has_changes:
-            print(f"✅ No product changes detected ({changes['total_current']} products)")
+            logger.debug("✅ No product changes detected (%s products)", changes['total_current'])
             return None
         
         # Site has changed - show summary first
-        print(f"\n🔄 SITE CHANGED: {site_name.upper()}")
-        print(f"📊 Product summary: {changes['total_previous']} → {changes['total_current']} products")
+        logger.info("🔄 SITE CHANGED: %s", site_name.upper())
+        logger.info("📊 Product summary: %s → %s products", changes['total_previous'], changes['total_current'])
         
         # Send notifications for changes
-        print(f"\n📱 Sending notifications for changes...")
-        send_notifications_for_changes(changes, site_name)
+        logger.info("📱 Sending notifications for changes...")
+        queue_notification(send_notifications_for_changes, changes, site_name)
           # Display detailed warnings for critical changes
         display_product_warnings(changes, site_name)
         
         # Log detailed changes to master file
         log_changes(changes, site_name)
         
-        print(f"\n✅ Change analysis complete for {site_name}")
+        logger.info("✅ Change analysis complete for %s", site_name)
         return changes  # Return the changes dict including current_products
         
     except Exception as e:
         error_msg = f"Error checking for changes on {site_name}: {e}"
-        print(f"❌ {error_msg}")
-        notifier.send_error_to_owner(error_msg)
+        logger.error("❌ %s", error_msg)
+        queue_notification(notifier.send_error_to_owner, error_msg)
         return None
 
+def check_site(site: dict, current_products: dict | None = None, validators: dict | None = None) -> bool | None:
+    """Check one site for changes and store the new state in its database.
+    Returns whether changes were detected, None if the check failed."""
+    try:
+        changes = has_site_changed(site["url"], site["name"], current_products, validators)
+        if changes:
+            logger.info("🔔 UPDATING DATABASE FOR %s...", site['name'].upper())
+            logger.info("📦 Storing updated product data (no re-scraping needed)...")
+            
+            # Use the already-scraped products instead of re-scraping
+            Product_into_db.store_products_from_dict(
+                changes.get('current_products', {}), 
+                site["name"]
+            )
+            
+            logger.info("✅ Database updated: %s_products.db", site['name'])
+            logger.info("=" * 60)
+            return True
+        
+        logger.info("✓ %s: No changes detected", site['name'])
+        return False
+            
+    except Exception as e:
+        error_msg = f"Error checking {site['name']} ({site['url']}): {e}"
+        logger.error("❌ %s", error_msg)
+        queue_notification(notifier.send_error_to_owner, error_msg)
+        return None
+
+def check_sites(sites: list) -> dict:
+    """Fetch the given sites concurrently and check each one as soon as its page is in.
+    Change analysis, notifications and database writes stay on this thread.
+    Returns {site name: changes detected (None if the check failed)}."""
+    results = {}
+    if not sites:
+        return results
+    with ThreadPoolExecutor(max_workers=len(sites)) as executor:
+        futures = {executor.submit(fetch_site_products, site["url"], site["name"]): site for site in sites}
+        for future in as_completed(futures):
+            site = futures[future]
+            try:
+                current_products, validators = future.result()
+            except Exception as e:
+                error_msg = f"Error analyzing changes for {site['name']}: {e}"
+                logger.error("❌ %s", error_msg)
+                queue_notification(notifier.send_error_to_owner, error_msg)
+                results[site["name"]] = None
+                continue
+            if current_products is None:
+                # 304 Not Modified: same page as the last processed fetch, nothing to parse or compare
+                logger.info("✓ %s: Page not modified", site['name'])
+                results[site["name"]] = False
+                continue
+            results[site["name"]] = check_site(site, current_products, validators)
+    return results
+
+def _request_shutdown(signum, frame):
+    logger.info("🛑 Received %s, stopping after the current check...", signal.Signals(signum).name)
+    _shutdown.set()
+
+def monitor_sites():
+    """Check every site until shutdown is requested, each on its own interval: an unchanged site is checked half as often
+    each time (up to MAX_CHECK_INTERVAL), a change puts it back to CHECK_INTERVAL.
+    Failed checks keep the current interval. Sites that are due together are fetched together."""
+    intervals = {site["name"]: CHECK_INTERVAL for site in SITES}
+    # Min-heap of (due time, index into SITES); every site is due right away
+    start = time.monotonic()
+    schedule = [(start, index) for index in range(len(SITES))]
+    if not schedule:
+        logger.warning("⚠️ No sites configured - nothing to monitor")
+        return
+    
+    while not _shutdown.is_set():
+        delay = schedule[0][0] - time.monotonic()
+        if delay > 0:
+            logger.debug("⏰ Waiting %.0f seconds before next check...", delay)
+            logger.debug("=" * 60)
+            if _shutdown.wait(delay):
+                break
+        
+        now = time.monotonic()
+        due = []
+        while schedule and schedule[0][0] <= now:
+            due.append(heapq.heappop(schedule)[1])
+        if not due:
+            # Woke up early (timer granularity); go back to waiting for the next due site
+            continue
+        
+        results = check_sites([SITES[index] for index in due])
+        for index in due:
+            name = SITES[index]["name"]
+            changed = results.get(name)
+            if changed:
+                intervals[name] = CHECK_INTERVAL
+            elif changed is False:
+                intervals[name] = min(intervals[name] * 2, MAX_CHECK_INTERVAL)
+            heapq.heappush(schedule, (time.monotonic() + intervals[name], index))
+
 if __name__ == "__main__":
     # Parse command line arguments
     args = parse_arguments()
@@ -747,49 +1038,25 @@ if __name__ == "__main__":
     if args.redo:
         redo_database()
     
-    print("🚀 Starting Yonex product monitoring with AI size analysis...")
-    print(f"📁 History directory: {HISTORY_DIR}")
-    print(f"📝 Master log file: yonex_product_changes.txt")
-    print(f"🤖 AI Provider: {ai_config['provider'].upper()} (Model: {ai_config['model']})")
-    print(f"📱 Push notifications: ENABLED")
-    print(f"👥 Owner ID: {notifier.owner_id}")
-    print(f"👀 Monitoring {len(SITES)} sites for product changes...")
-    print("⚠️  Will send notifications for all product changes")
-    print("-" * 60)
-    
-    # Check and update database schema for existing databases
-    db_dir = Path(__file__).parent / 'yonex_data' / 'databases'
-    if db_dir.exists():
-        for site in SITES:
-            db_path = db_dir / f"{site['name']}_products.db"
-            if db_path.exists():
-                add_sizes_column_to_database(db_path)
-                update_sizes_for_existing_products(db_path, site['name'])
+    logger.info("🚀 Starting Yonex product monitoring with AI size analysis...")
+    logger.info("📁 History directory: %s", HISTORY_DIR)
+    logger.info("📝 Master log file: yonex_product_changes.txt")
+    logger.info("🤖 AI Provider: %s (Model: %s)", ai_config['provider'].upper(), ai_config['model'])
+    logger.info("📱 Push notifications: ENABLED")
+    logger.info("👥 Owner ID: %s", notifier.owner_id)
+    logger.info("👀 Monitoring %d sites for product changes...", len(SITES))
+    logger.info("⚠️  Will send notifications for all product changes")
+    logger.info("-" * 60)
     
-    while True:
-        for site in SITES:
-            try:
-                changes = has_site_changed(site["url"], site["name"])
-                if changes:
-                    print(f"\n🔔 UPDATING DATABASE FOR {site['name'].upper()}...")
-                    print("📦 Storing updated product data (no re-scraping needed)...")
-                    
-                    # Use the already-scraped products instead of re-scraping
-                    Product_into_db.store_products_from_dict(
-                        changes.get('current_products', {}), 
-                        site["name"]
-                    )
-                    
-                    print(f"✅ Database updated: {site['name']}_products.db")
-                    print("=" * 60)
-                else:
-                    print(f"✓ {site['name']}: No changes detected")
-                    
-            except Exception as e:
-                error_msg = f"Error checking {site['name']} ({site['url']}): {e}"
-                print(f"❌ {error_msg}")
-                notifier.send_error_to_owner(error_msg)
-
-        print(f"\n⏰ Waiting 20 seconds before next check...")
-        print("=" * 60)
-        time.sleep(20)
\ No newline at end of file
+    # Check and update database schema for existing databases (found with one directory listing);
+    # all sites migrate at once since the size analysis waits on the AI
+    existing_databases = {entry.name for entry in os.scandir(DB_DIR)}
+    sites_with_database = [site for site in SITES if f"{site['name']}_products.db" in existing_databases]
+    if sites_with_database:
+        with ThreadPoolExecutor(max_workers=len(sites_with_database)) as executor:
+            list(executor.map(migrate_site_database, sites_with_database))
+    
+    signal.signal(signal.SIGTERM, _request_shutdown)
+    signal.signal(signal.SIGINT, _request_shutdown)
+    monitor_sites()
+    logger.info("👋 Monitoring stopped")
\ No newline at end of file